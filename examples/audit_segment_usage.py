@@ -18,36 +18,37 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from database import get_unrefined_segments, get_refined_segments
+from database import (
+    iter_unrefined_ids, get_source_segment_counts,
+    get_reused_unrefined_segment_ids, get_invalid_source_segments
+)
 import json
 
 def audit_segment_integrity():
     print("Auditing segment integrity...\n")
 
-    unrefined_ids = [seg['id'] for seg in get_unrefined_segments()]
-    print(f"🔍 Unrefined Segment IDs: {sorted(unrefined_ids)}")
+    unrefined_ids = list(iter_unrefined_ids())
+    print(f"🔍 Unrefined Segment IDs: {unrefined_ids}")
 
-    refined = get_refined_segments()
-    all_used_ids = set()
-    duplicates = set()
-
-    for ref in refined:
-        source = ref['source_segments']
-        if not source:
-            continue
+    # SQLite only flags the rows; decoding them again recovers the error detail
+    for ref_id, source in get_invalid_source_segments():
         try:
-            raw_ids = json.loads(source)
-            for rid in raw_ids:
-                if rid in all_used_ids:
-                    duplicates.add(rid)
-                all_used_ids.add(rid)
+            json.loads(source)
+            error = "not valid JSON"
         except Exception as e:
-            print(f"⚠️ Error decoding source_segments for refined id {ref['id']}: {e}")
+            error = e
+        snippet = source if len(source) <= 80 else source[:77] + "..."
+        print(f"⚠️ Error decoding source_segments for refined id {ref_id}: {error} ({snippet!r})")
+
+    # Flattening and counting happen in SQLite via json_each
+    counts = get_source_segment_counts()
+    all_used_ids = {sid for sid, _ in counts}
+    duplicates = {sid for sid, c in counts if c > 1}
 
     print(f"\n✅ Total Used Segment IDs: {len(all_used_ids)}")
     print(f"⚠️ Duplicate Raw Segment IDs Across Refined Segments: {sorted(duplicates)}" if duplicates else "✔️ No duplicate raw segments in refined data.")
 
-    reused_unrefined = [rid for rid in unrefined_ids if rid in all_used_ids]
+    reused_unrefined = get_reused_unrefined_segment_ids()
     if reused_unrefined:
         print(f"\n🛑 THESE RAW SEGMENTS ARE UNREFINED *AND* ALREADY USED: {reused_unrefined}")
     else:
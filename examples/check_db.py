@@ -20,53 +20,70 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import sqlite3
 import os
-from datetime import datetime
+import sys
+from datetime import datetime, timezone
+
+# Flush output every this many rows so large tables stream visibly
+FLUSH_EVERY = 1000
+
+def _format_epoch(value):
+    """Render an integer unix-epoch timestamp as UTC; leave other values as-is."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+    return value
+
+def _walk(cur, query, print_row):
+    """Print each row of a query as it is read, without fetching the whole result."""
+    for count, row in enumerate(cur.execute(query), 1):
+        print_row(row)
+        if count % FLUSH_EVERY == 0:
+            sys.stdout.flush()
 
 def check_db():
     db_path = os.path.join(os.path.dirname(__file__), 'thalamus.db')
-    conn = sqlite3.connect(db_path)
+    # Open read-only so inspection never takes a write lock
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
     conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA query_only=1')
     cur = conn.cursor()
     
     print("\n=== Sessions ===")
-    cur.execute('SELECT * FROM sessions')
-    sessions = cur.fetchall()
-    for session in sessions:
-        print(f"ID: {session['id']}, Session ID: {session['session_id']}, Created: {session['created_at']}")
+    _walk(cur, 'SELECT * FROM sessions', lambda session: print(
+        f"ID: {session['id']}, Session ID: {session['session_id']}, Created: {session['created_at']}"
+    ))
     
     print("\n=== Speakers ===")
-    cur.execute('SELECT * FROM speakers')
-    speakers = cur.fetchall()
-    for speaker in speakers:
-        print(f"ID: {speaker['id']}, Name: {speaker['name']}, Created: {speaker['created_at']}")
+    _walk(cur, 'SELECT * FROM speakers', lambda speaker: print(
+        f"ID: {speaker['id']}, Name: {speaker['name']}, Created: {speaker['created_at']}"
+    ))
     
     print("\n=== Raw Segments ===")
-    cur.execute('''
+    def print_segment(segment):
+        print(f"ID: {segment['id']}, Session: {segment['session_id']}, Speaker: {segment['speaker_name']}")
+        print(f"Text: {segment['text']}")
+        print(f"Time: {segment['start_time']} -> {segment['end_time']}")
+        print(f"Timestamp: {_format_epoch(segment['timestamp'])}\n")
+    _walk(cur, '''
         SELECT s.*, sp.name as speaker_name 
         FROM raw_segments s
         JOIN speakers sp ON s.speaker_id = sp.id
         ORDER BY s.timestamp
-    ''')
-    segments = cur.fetchall()
-    for segment in segments:
-        print(f"ID: {segment['id']}, Session: {segment['session_id']}, Speaker: {segment['speaker_name']}")
-        print(f"Text: {segment['text']}")
-        print(f"Time: {segment['start_time']} -> {segment['end_time']}")
-        print(f"Timestamp: {segment['timestamp']}\n")
+    ''', print_segment)
     
     print("\n=== Refined Segments ===")
-    cur.execute('''
-        SELECT * FROM refined_segments
-        ORDER BY start_time, id
-    ''')
-    refined = cur.fetchall()
-    for segment in refined:
+    def print_refined(segment):
         print(f"ID: {segment['id']}, Session: {segment['session_id']}, Speaker: {segment['refined_speaker_id']}")
         print(f"Text: {segment['text']}")
         print(f"Time: {segment['start_time']} -> {segment['end_time']}")
         print(f"Confidence: {segment['confidence_score']}")
         print(f"Source Segments: {segment['source_segments']}")
         print(f"Metadata: {segment['metadata']}\n")
+    _walk(cur, '''
+        SELECT * FROM refined_segments
+        ORDER BY start_time, id
+    ''', print_refined)
+    
+    conn.close()
 
 if __name__ == '__main__':
     check_db() 
\ No newline at end of file
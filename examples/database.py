@@ -19,48 +19,211 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import sqlite3
-from datetime import datetime
+import threading
+import atexit
+from datetime import datetime, timezone
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union, Iterable, FrozenSet
 import logging
 
 import os
 DB_PATH = os.path.join(os.path.dirname(__file__), 'thalamus.db')
+STATEMENT_CACHE_SIZE = 128
+
+# Rows pulled from SQLite per fetchmany() call when streaming results
+FETCH_BATCH_SIZE = 1000
+
+# Timestamp columns stored as integer unix-epoch seconds
+EPOCH_COLUMNS = (
+    ('raw_segments', 'timestamp'),
+    ('refined_segments', 'last_update'),
+    ('segment_usage', 'timestamp'),
+)
 logger = logging.getLogger(__name__)
 
-@contextmanager
-def get_db():
-    """Get a database connection with proper timeout and row factory."""
-    conn = sqlite3.connect(DB_PATH, timeout=5.0)
+# Use orjson for source_segments/metadata serialization when available
+try:
+    import orjson
+    _json_dumps = lambda obj: orjson.dumps(obj).decode()
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# One cached connection per thread, closed at interpreter exit
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+
+# Readers each use their own thread's connection under WAL; writers also
+# take this lock so only one thread writes at a time instead of spinning
+# on SQLITE_BUSY until the timeout
+_write_lock = threading.RLock()
+
+# Hot-path statements, kept as constants so the driver's per-connection
+# statement cache always sees byte-identical SQL
+SQL_UPSERT_SESSION = '''
+    INSERT INTO sessions (session_id) VALUES (?)
+    ON CONFLICT (session_id) DO UPDATE SET session_id = excluded.session_id
+    RETURNING id
+'''
+SQL_UPSERT_SPEAKER = '''
+    INSERT INTO speakers (name) VALUES (?)
+    ON CONFLICT (name) DO UPDATE SET name = excluded.name
+    RETURNING id
+'''
+SQL_INSERT_SEGMENT = '''
+    INSERT INTO raw_segments 
+    (session_id, speaker_id, text, start_time, end_time, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+# Epoch timestamps are written explicitly: tables created before the switch
+# to integer epochs keep their old CURRENT_TIMESTAMP text defaults
+SQL_EPOCH_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+SQL_INSERT_REFINED_SEGMENT = '''
+    INSERT INTO refined_segments (
+        session_id, refined_speaker_id, text, start_time, end_time,
+        confidence_score, source_segments, metadata, is_processing, last_update
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ''' + SQL_EPOCH_NOW + ''')
+'''
+SQL_INSERT_SPEAKER_IF_MISSING = "INSERT OR IGNORE INTO speakers (name) VALUES (?)"
+SQL_INSERT_SEGMENT_USAGE = (
+    "INSERT OR IGNORE INTO segment_usage (raw_segment_id, refined_segment_id, timestamp) "
+    "VALUES (?, ?, " + SQL_EPOCH_NOW + ")"
+)
+
+# Unrefined-segment queries, one fixed statement each for the filtered
+# and unfiltered cases
+_UNREFINED_FROM = """
+    FROM raw_segments rs
+    JOIN speakers s ON rs.speaker_id = s.id
+    LEFT JOIN segment_usage su ON su.raw_segment_id = rs.id
+    WHERE su.raw_segment_id IS NULL
+"""
+SQL_UNREFINED_SEGMENTS = """
+    SELECT 
+        rs.id,
+        rs.session_id,
+        rs.speaker_id,
+        rs.text,
+        rs.start_time,
+        rs.end_time,
+        rs.timestamp,
+        s.name as speaker_name
+""" + _UNREFINED_FROM
+SQL_UNREFINED_SEGMENTS_BY_SESSION = SQL_UNREFINED_SEGMENTS + " AND rs.session_id = ?"
+SQL_UNREFINED_SEGMENTS_GROUPED = SQL_UNREFINED_SEGMENTS + " ORDER BY rs.session_id, rs.start_time, rs.id"
+SQL_UNREFINED_IDS = "SELECT rs.id" + _UNREFINED_FROM + " ORDER BY rs.id"
+SQL_UNREFINED_IDS_BY_SESSION = "SELECT rs.id" + _UNREFINED_FROM + " AND rs.session_id = ? ORDER BY rs.id"
+
+def _connect():
+    """Open a new connection and apply the per-connection pragmas."""
+    # Size the driver's prepared-statement cache explicitly; every statement
+    # in this module fits, so repeat calls skip SQLite's parse/prepare step.
+    # isolation_level=None: single statements autocommit and multi-statement
+    # writes open their own transaction via transaction()
+    conn = sqlite3.connect(
+        DB_PATH, timeout=5.0, check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE, isolation_level=None
+    )
     conn.row_factory = sqlite3.Row
     
-    # Register JSON array contains function
-    def json_array_contains(arr_str, value):
-        """Check if a JSON array string contains a value."""
-        try:
-            if arr_str is None:
-                return False
-            arr = json.loads(arr_str)
-            if not isinstance(arr, list):
-                return False
-            # Convert value to int since segment IDs are integers
-            target = int(value)
-            return target in [int(x) for x in arr]
-        except:
-            return False
+    # WAL lets readers proceed while a writer commits; NORMAL sync is safe under WAL
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-65536')
+    conn.execute('PRAGMA wal_autocheckpoint=1000')
+    conn.execute('PRAGMA foreign_keys=ON')
     
-    conn.create_function("json_array_contains", 2, json_array_contains)
+    with _connections_lock:
+        _connections.append(conn)
+    return conn
+
+@atexit.register
+def close_db():
+    """Close every cached connection."""
+    with _connections_lock:
+        while _connections:
+            _connections.pop().close()
+    _local.__dict__.clear()
+
+@contextmanager
+def get_db():
+    """Get this thread's cached database connection.
+    
+    The connection is reused across calls rather than closed; any
+    transaction left open by a failing caller is rolled back, unless an
+    enclosing transaction() owns it.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None or getattr(_local, 'path', None) != DB_PATH:
+        conn = _connect()
+        _local.conn = conn
+        _local.path = DB_PATH
     
     try:
         yield conn
-    finally:
-        conn.close()
+    except Exception:
+        if conn.in_transaction and not _in_transaction():
+            conn.rollback()
+        raise
+
+@contextmanager
+def write_db():
+    """Get this thread's connection while holding the process-wide writer lock."""
+    with _write_lock:
+        with get_db() as conn:
+            yield conn
+
+def _in_transaction():
+    """Whether this thread is inside a transaction() block."""
+    return getattr(_local, 'tx_depth', 0) > 0
+
+def _commit(conn):
+    """Commit now, unless an enclosing transaction() will commit instead."""
+    if not _in_transaction():
+        conn.commit()
+
+@contextmanager
+def transaction():
+    """Run a batch of writes in one transaction with a single commit.
+    
+    The insert/update helpers called inside skip their own commits.
+    Nested blocks join the outermost one; on error everything is
+    rolled back.
+    """
+    with write_db() as conn:
+        if _in_transaction():
+            _local.tx_depth += 1
+            try:
+                yield conn
+            finally:
+                _local.tx_depth -= 1
+            return
+        
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute('BEGIN IMMEDIATE')
+        _local.tx_depth = 1
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            _local.tx_depth = 0
 
 def init_db():
     """Initialize the database with required tables."""
     try:
-        with get_db() as conn:
+        with transaction() as conn:
             cur = conn.cursor()
             
             # Create sessions table
@@ -90,7 +253,7 @@ def init_db():
                     text TEXT NOT NULL,
                     start_time REAL NOT NULL,
                     end_time REAL NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     FOREIGN KEY (speaker_id) REFERENCES speakers (id)
                 )
             ''')
@@ -107,7 +270,7 @@ def init_db():
                     confidence_score REAL DEFAULT 0,
                     source_segments TEXT,
                     metadata TEXT,
-                    last_update TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_update INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     is_processing INTEGER DEFAULT 0,
                     FOREIGN KEY (refined_speaker_id) REFERENCES speakers (id)
                 )
@@ -118,13 +281,51 @@ def init_db():
                 CREATE TABLE IF NOT EXISTS segment_usage (
                     raw_segment_id INTEGER PRIMARY KEY,
                     refined_segment_id INTEGER,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     FOREIGN KEY (refined_segment_id) REFERENCES refined_segments (id)
                 )
             ''')
             
-            conn.commit()
-            logger.info("Database initialized successfully")
+            # Convert text timestamps from databases created before the
+            # columns became unix-epoch integers
+            for table, column in EPOCH_COLUMNS:
+                cur.execute(f'''
+                    UPDATE {table}
+                    SET {column} = CAST(strftime('%s', {column}) AS INTEGER)
+                    WHERE typeof({column}) = 'text' AND strftime('%s', {column}) IS NOT NULL
+                ''')
+            
+            # Indexes for the hot session/speaker lookups and start_time ordering
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_raw_segments_session_start ON raw_segments (session_id, start_time)')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_raw_segments_speaker ON raw_segments (speaker_id)')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_raw_segments_session_timestamp ON raw_segments (session_id, timestamp)')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_refined_session_start ON refined_segments (session_id, start_time)')
+            cur.execute('CREATE INDEX IF NOT EXISTS idx_refined_speaker_session ON refined_segments (refined_speaker_id, session_id)')
+            
+            # Older databases can hold duplicate speaker names (the old
+            # lookup-then-insert raced between processes); fold each name
+            # onto its lowest id so the unique index can be built
+            for table, column in (('raw_segments', 'speaker_id'),
+                                  ('refined_segments', 'refined_speaker_id')):
+                cur.execute(f'''
+                    UPDATE {table}
+                    SET {column} = (
+                        SELECT MIN(keep.id) FROM speakers dup
+                        JOIN speakers keep ON keep.name = dup.name
+                        WHERE dup.id = {table}.{column}
+                    )
+                    WHERE {column} IN (
+                        SELECT id FROM speakers
+                        WHERE id NOT IN (SELECT MIN(id) FROM speakers GROUP BY name)
+                    )
+                ''')
+            cur.execute('DELETE FROM speakers WHERE id NOT IN (SELECT MIN(id) FROM speakers GROUP BY name)')
+            cur.execute('CREATE UNIQUE INDEX IF NOT EXISTS ux_speakers_name ON speakers (name)')
+            
+            # Refresh planner statistics so the new indexes get picked
+            cur.execute('ANALYZE')
+            
+        logger.info("Database initialized successfully")
             
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
@@ -132,101 +333,217 @@ def init_db():
 
 def get_or_create_session(session_id):
     """Get or create a session and return its ID."""
-    with get_db() as conn:
+    with write_db() as conn:
         cur = conn.cursor()
-        cur.execute('SELECT id FROM sessions WHERE session_id = ?', (session_id,))
-        result = cur.fetchone()
-        
-        if result:
-            return result['id']
-        
-        cur.execute('INSERT INTO sessions (session_id) VALUES (?)', (session_id,))
-        conn.commit()
-        return cur.lastrowid
+        # One statement for both paths; no window between lookup and insert
+        cur.execute(SQL_UPSERT_SESSION, (session_id,))
+        session_db_id = cur.fetchone()[0]
+        _commit(conn)
+        return session_db_id
 
 def get_or_create_speaker(speaker_id, speaker_name, is_user=False):
     """Get or create a speaker and return their ID."""
-    with get_db() as conn:
+    with write_db() as conn:
         cur = conn.cursor()
-        # First try to find by name
-        cur.execute('SELECT id FROM speakers WHERE name = ?', (speaker_name,))
-        result = cur.fetchone()
-        
-        if result:
-            return result['id']
-        
-        # If not found, create new speaker
-        cur.execute(
-            'INSERT INTO speakers (name) VALUES (?)',
-            (speaker_name,)
-        )
-        conn.commit()
-        return cur.lastrowid
+        # Speakers are unique by name, so one upsert covers both the hit and miss paths
+        cur.execute(SQL_UPSERT_SPEAKER, (speaker_name,))
+        speaker_db_id = cur.fetchone()[0]
+        _commit(conn)
+        return speaker_db_id
+
+def get_or_create_speakers(speaker_names: Iterable[str]) -> Dict[str, int]:
+    """Get or create several speakers at once and return {name: id}.
+    
+    Missing names are inserted with one executemany and every ID is read
+    back with a single IN query, all in one transaction.
+    """
+    names = list(dict.fromkeys(speaker_names))
+    if not names:
+        return {}
+    
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.executemany(SQL_INSERT_SPEAKER_IF_MISSING, ((name,) for name in names))
+        placeholders = ','.join('?' * len(names))
+        cur.execute(f'SELECT name, id FROM speakers WHERE name IN ({placeholders})', names)
+        return {name: speaker_db_id for name, speaker_db_id in cur}
+
+def to_epoch(value) -> Optional[int]:
+    """Convert a datetime, ISO string or number to integer unix-epoch seconds.
+    
+    Naive datetimes and strings are taken as UTC, matching the SQL migration
+    of old text timestamps.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
 
 def insert_segment(session_id, speaker_id, text, start_time, end_time, log_timestamp):
     """Insert a new segment."""
-    with get_db() as conn:
+    with write_db() as conn:
         cur = conn.cursor()
-        cur.execute('''
-            INSERT INTO raw_segments 
-            (session_id, speaker_id, text, start_time, end_time, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (session_id, speaker_id, text, start_time, end_time, log_timestamp))
-        conn.commit()
+        cur.execute(SQL_INSERT_SEGMENT, (session_id, speaker_id, text, start_time, end_time, to_epoch(log_timestamp)))
+        _commit(conn)
         return cur.lastrowid
 
+def insert_segments(segments: Iterable[tuple]) -> int:
+    """Insert many segments with one executemany in a single transaction.
+    
+    Each item is a (session_id, speaker_id, text, start_time, end_time,
+    log_timestamp) tuple; any iterable works, including a generator.
+    log_timestamp is stored as unix-epoch seconds (see to_epoch).
+    Inside an enclosing transaction() the rows join that transaction.
+    Returns the number of rows inserted.
+    """
+    with transaction() as conn:
+        cur = conn.cursor()
+        cur.executemany(
+            SQL_INSERT_SEGMENT,
+            (row[:5] + (to_epoch(row[5]),) for row in segments)
+        )
+        return max(cur.rowcount, 0)
+
+def _fetch_batches(cur):
+    """Yield lists of rows from an executed cursor, FETCH_BATCH_SIZE at a time."""
+    cur.arraysize = FETCH_BATCH_SIZE
+    return iter(cur.fetchmany, [])
+
+def iter_unrefined_segments(session_id: str = None):
+    """Yield unprocessed raw segments one dict at a time, optionally filtered by session.
+    
+    Rows stream straight from the cursor, so the generator should be
+    consumed before the next query runs on this thread's connection.
+    """
+    with get_db() as conn:
+        cur = conn.cursor()
+        
+        # Add session filter if provided
+        if session_id:
+            logger.debug("Executing query: %s with params: %s", SQL_UNREFINED_SEGMENTS_BY_SESSION, session_id)
+            cur.execute(SQL_UNREFINED_SEGMENTS_BY_SESSION, (session_id,))
+        else:
+            logger.debug("Executing query: %s", SQL_UNREFINED_SEGMENTS)
+            cur.execute(SQL_UNREFINED_SEGMENTS)
+        
+        # Rows are sqlite3.Row, which converts to a dict in C
+        for batch in _fetch_batches(cur):
+            for row in batch:
+                yield dict(row)
+
 def get_unrefined_segments(session_id: str = None) -> List[Dict]:
     """Get all unprocessed raw segments, optionally filtered by session."""
+    try:
+        results = list(iter_unrefined_segments(session_id))
+        logger.debug("Query returned %d results", len(results))
+        return results
+    except Exception as e:
+        logger.error(f"Error getting unrefined segments: {e}")
+        return []
+
+def get_unrefined_segments_by_session() -> Dict[str, List[Dict]]:
+    """Get every unprocessed raw segment in one query, grouped by session.
+    
+    Only sessions with pending segments appear; each list is in
+    start_time order.
+    """
     try:
         with get_db() as conn:
             cur = conn.cursor()
-            
-            # Base query with speaker info
-            query = """
-                SELECT 
-                    rs.id,
-                    rs.session_id,
-                    rs.speaker_id,
-                    rs.text,
-                    rs.start_time,
-                    rs.end_time,
-                    rs.timestamp,
-                    s.name as speaker_name
+            cur.execute(SQL_UNREFINED_SEGMENTS_GROUPED)
+            rows = (dict(row) for batch in _fetch_batches(cur) for row in batch)
+            return {
+                session_id: list(group)
+                for session_id, group in groupby(rows, key=itemgetter('session_id'))
+            }
+    except Exception as e:
+        logger.error(f"Error getting unrefined segments by session: {e}")
+        return {}
+
+def iter_unrefined_ids(session_id: str = None):
+    """Yield the IDs of unprocessed raw segments in ID order, without building rows."""
+    with get_db() as conn:
+        cur = conn.cursor()
+        if session_id:
+            cur.execute(SQL_UNREFINED_IDS_BY_SESSION, (session_id,))
+        else:
+            cur.execute(SQL_UNREFINED_IDS)
+        for row in cur:
+            yield row[0]
+
+def get_used_segment_ids() -> FrozenSet[int]:
+    """Get the set of raw segment IDs that have been used in refinements."""
+    try:
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute('SELECT raw_segment_id FROM segment_usage')
+            return frozenset(row[0] for row in cur)
+    except Exception as e:
+        logger.error(f"Error getting used segment IDs: {e}")
+        return frozenset()
+
+def get_source_segment_counts() -> List[tuple]:
+    """Get (raw_segment_id, count) for every raw ID referenced by refined segments.
+
+    Flattens the source_segments JSON arrays in SQLite via json_each, so
+    callers can derive used and duplicated IDs without decoding each row.
+    Rows whose source_segments is not valid JSON are skipped.
+    """
+    try:
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT CAST(je.value AS INTEGER) AS sid, COUNT(*) AS c
+                FROM refined_segments rs, json_each(rs.source_segments) je
+                WHERE json_valid(rs.source_segments)
+                GROUP BY sid
+            """)
+            return [(row[0], row[1]) for row in cur.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting source segment counts: {e}")
+        return []
+
+def get_reused_unrefined_segment_ids() -> List[int]:
+    """Get unrefined raw segment IDs that already appear in a refined segment."""
+    try:
+        with get_db() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT rs.id
                 FROM raw_segments rs
                 JOIN speakers s ON rs.speaker_id = s.id
-                WHERE rs.id NOT IN (
-                    SELECT raw_segment_id FROM segment_usage
-                )
-            """
-            
-            # Add session filter if provided
-            if session_id:
-                query += " AND rs.session_id = ?"
-                logger.debug(f"Executing query: {query} with params: {session_id}")
-                cur.execute(query, (session_id,))
-            else:
-                logger.debug(f"Executing query: {query}")
-                cur.execute(query)
-            
-            # Convert to list of dicts
-            columns = [col[0] for col in cur.description]
-            results = [dict(zip(columns, row)) for row in cur.fetchall()]
-            logger.debug(f"Query returned {len(results)} results")
-            return results
-            
+                JOIN (
+                    SELECT DISTINCT CAST(je.value AS INTEGER) AS sid
+                    FROM refined_segments ref, json_each(ref.source_segments) je
+                    WHERE json_valid(ref.source_segments)
+                ) u ON rs.id = u.sid
+                LEFT JOIN segment_usage su ON su.raw_segment_id = rs.id
+                WHERE su.raw_segment_id IS NULL
+                ORDER BY rs.id
+            """)
+            return [row[0] for row in cur.fetchall()]
     except Exception as e:
-        logger.error(f"Error getting unrefined segments: {e}")
+        logger.error(f"Error getting reused unrefined segment IDs: {e}")
         return []
 
-def get_used_segment_ids() -> List[int]:
-    """Get list of raw segment IDs that have been used in refinements."""
+def get_invalid_source_segments() -> List[Tuple[int, str]]:
+    """Get (id, source_segments) for refined segments whose source_segments is not valid JSON."""
     try:
         with get_db() as conn:
             cur = conn.cursor()
-            cur.execute('SELECT raw_segment_id FROM segment_usage')
-            return [row[0] for row in cur.fetchall()]
+            cur.execute("""
+                SELECT id, source_segments FROM refined_segments
+                WHERE source_segments IS NOT NULL AND source_segments != ''
+                AND NOT json_valid(source_segments)
+            """)
+            return [(row[0], row[1]) for row in cur.fetchall()]
     except Exception as e:
-        logger.error(f"Error getting used segment IDs: {e}")
+        logger.error(f"Error getting invalid source segments: {e}")
         return []
 
 def insert_refined_segment(
@@ -236,22 +553,31 @@ def insert_refined_segment(
     start_time: float,
     end_time: float,
     confidence_score: float = 0,
-    source_segments: str = None,
+    source_segments: Union[str, List[int]] = None,
     metadata: str = None,
     is_processing: int = 0
 ) -> Optional[int]:
-    """Insert a new refined segment and record segment usage."""
+    """Insert a new refined segment and record segment usage.
+    
+    source_segments may be a JSON array string or the list of raw segment
+    IDs itself; passing the list skips decoding it back for segment_usage.
+    """
     try:
-        with get_db() as conn:
+        # Serialize once and keep the decoded IDs for the usage rows
+        if isinstance(source_segments, list):
+            source_ids = source_segments
+            source_segments = _json_dumps(source_ids)
+        elif source_segments:
+            source_ids = _json_loads(source_segments)
+        else:
+            source_ids = []
+        
+        # Refined row and its usage rows land together or not at all
+        with transaction() as conn:
             cur = conn.cursor()
             
             # Insert refined segment
-            cur.execute('''
-                INSERT INTO refined_segments (
-                    session_id, refined_speaker_id, text, start_time, end_time,
-                    confidence_score, source_segments, metadata, is_processing
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            cur.execute(SQL_INSERT_REFINED_SEGMENT, (
                 session_id, refined_speaker_id, text, start_time, end_time,
                 confidence_score, source_segments, metadata, is_processing
             ))
@@ -259,33 +585,60 @@ def insert_refined_segment(
             segment_id = cur.lastrowid
             
             # Record segment usage
-            if source_segments:
-                for raw_id in json.loads(source_segments):
-                    cur.execute(
-                        "INSERT OR IGNORE INTO segment_usage (raw_segment_id, refined_segment_id) VALUES (?, ?)",
-                        (raw_id, segment_id)
-                    )
+            if source_ids:
+                cur.executemany(
+                    SQL_INSERT_SEGMENT_USAGE,
+                    [(raw_id, segment_id) for raw_id in source_ids]
+                )
             
-            conn.commit()
             return segment_id
             
     except Exception as e:
         logger.error(f"Error inserting refined segment: {e}")
         raise
 
-def get_refined_segments(session_id=None):
-    """Get refined segments."""
+def insert_refined_segments(segments: Iterable[Dict]) -> List[int]:
+    """Insert many refined segments and their usage rows in one transaction.
+    
+    Each item is a dict of insert_refined_segment keyword arguments.
+    Returns the new refined segment IDs in order.
+    """
+    with transaction():
+        return [insert_refined_segment(**segment) for segment in segments]
+
+def iter_refined_segments(session_id=None, after=None, limit=None):
+    """Yield refined segments one row at a time straight from the cursor.
+    
+    Pages by keyset: pass the (start_time, id) of the last row already
+    seen as `after` to continue from it, so a later page costs the same
+    as the first.
+    """
+    conditions = []
+    params = []
+    if session_id:
+        conditions.append('session_id = ?')
+        params.append(session_id)
+    if after is not None:
+        conditions.append('(start_time, id) > (?, ?)')
+        params.extend(after)
+    
+    query = 'SELECT * FROM refined_segments'
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' ORDER BY start_time, id'
+    if limit:
+        query += ' LIMIT ?'
+        params.append(limit)
+    
     with get_db() as conn:
         cur = conn.cursor()
-        if session_id:
-            cur.execute('''
-                SELECT * FROM refined_segments 
-                WHERE session_id = ?
-                ORDER BY start_time
-            ''', (session_id,))
-        else:
-            cur.execute('SELECT * FROM refined_segments ORDER BY start_time')
-        return cur.fetchall()
+        cur.execute(query, params)
+        for batch in _fetch_batches(cur):
+            yield from batch
+
+def get_refined_segments(session_id=None, after=None, limit=None):
+    """Get refined segments, optionally one keyset page at a time."""
+    return list(iter_refined_segments(session_id, after, limit))
 
 def get_locked_segments(session_id, limit=None):
     """Get the most recent locked refined segments for a session."""
@@ -303,34 +656,36 @@ def get_locked_segments(session_id, limit=None):
             cur.execute(query, (session_id,))
         return cur.fetchall()
 
+UPDATABLE_REFINED_FIELDS = frozenset([
+    'text', 'start_time', 'end_time', 'confidence_score', 'source_segments', 'metadata'
+])
+
+@lru_cache(maxsize=64)
+def _build_update_sql(keys: tuple) -> str:
+    """Build the UPDATE statement for one set of refined segment fields.
+    
+    Memoized by the sorted field names, so each update shape produces the
+    same SQL text and hits the driver's statement cache.
+    """
+    return f"""
+        UPDATE refined_segments 
+        SET {', '.join(f"{key} = ?" for key in keys)}
+        WHERE id = ?
+    """
+
 def update_refined_segment(segment_id: int, **kwargs) -> bool:
     """Update an existing refined segment with new values."""
     try:
-        with get_db() as conn:
+        keys = tuple(sorted(key for key in kwargs if key in UPDATABLE_REFINED_FIELDS))
+        if not keys:
+            return False
+        values = [kwargs[key] for key in keys]
+        values.append(segment_id)
+        
+        with write_db() as conn:
             cur = conn.cursor()
-            
-            # Build update query dynamically based on provided kwargs
-            update_fields = []
-            values = []
-            for key, value in kwargs.items():
-                if key in ['text', 'start_time', 'end_time', 'confidence_score', 'source_segments', 'metadata']:
-                    update_fields.append(f"{key} = ?")
-                    values.append(value)
-            
-            if not update_fields:
-                return False
-                
-            # Add segment_id to values
-            values.append(segment_id)
-            
-            # Execute update
-            query = f"""
-                UPDATE refined_segments 
-                SET {', '.join(update_fields)}
-                WHERE id = ?
-            """
-            cur.execute(query, values)
-            conn.commit()
+            cur.execute(_build_update_sql(keys), values)
+            _commit(conn)
             
             return True
             
@@ -343,6 +698,8 @@ def get_refined_segment(segment_id: int) -> dict:
     try:
         with get_db() as conn:
             cur = conn.cursor()
+            # The dict below is built positionally, so skip sqlite3.Row
+            cur.row_factory = None
             query = """
                 SELECT 
                     id,
@@ -384,12 +741,13 @@ def get_active_sessions():
         with get_db() as conn:
             cur = conn.cursor()
             query = """
-                SELECT DISTINCT session_id, MIN(timestamp) as created_at
-                FROM raw_segments
-                WHERE id NOT IN (
-                    SELECT raw_segment_id FROM segment_usage
+                SELECT rs.session_id, MIN(rs.timestamp) as created_at
+                FROM raw_segments rs
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM segment_usage su
+                    WHERE su.raw_segment_id = rs.id
                 )
-                GROUP BY session_id
+                GROUP BY rs.session_id
                 ORDER BY created_at DESC
             """
             cur.execute(query)
@@ -21,11 +21,14 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
 import asyncio
+import heapq
+import itertools
 import json
 import os
-from datetime import datetime
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Tuple
 import re
 import random
 import textwrap
@@ -53,49 +56,70 @@ SCENARIO = "forensiq"
 
 # Memory pane: wrap inside bordered column (240 terminal / 3 columns minus border+padding).
 MEMORY_WRAP_WIDTH = 68
+# Memory pane scrollback; the oldest lines drop off once it is full.
+MEMORY_MAX_LINES = 1000
+
+# Last HH:MM:SS timestamp handed out, reused until the second changes
+_ts_second = -1
+_ts_text = ""
+
+def _ts() -> str:
+    """Current local time as HH:MM:SS for log and chat lines."""
+    global _ts_second, _ts_text
+    now = int(time.time())
+    if now != _ts_second:
+        lt = time.localtime(now)
+        _ts_second = now
+        _ts_text = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+    return _ts_text
+
+# Message of the day shown after the fake SSH login
+_MOTD_LINES = (
+    "",
+    "  ╔═══════════════════════════════════════════════════════════════════════╗",
+    "  ║                                                                       ║",
+    "  ║   ███████  █████  ███    ██  ██████ ████████ ██    ██ ███    ███     ║",
+    "  ║   ██      ██   ██ ████   ██ ██         ██    ██    ██ ████  ████     ║",
+    "  ║   ███████ ███████ ██ ██  ██ ██         ██    ██    ██ ██ ████ ██     ║",
+    "  ║        ██ ██   ██ ██  ██ ██ ██         ██    ██    ██ ██  ██  ██     ║",
+    "  ║   ███████ ██   ██ ██   ████  ██████    ██     ██████  ██      ██     ║",
+    "  ║                                                                       ║",
+    "  ║                     Security Suite v3.7.2                           ║",
+    "  ║                                                                       ║",
+    "  ║                 Cognitive Threat Analysis Platform                   ║",
+    "  ║                                                                       ║",
+    "  ╚═══════════════════════════════════════════════════════════════════════╝",
+    "",
+    "  [CLASSIFIED] Remote Access Terminal",
+    "  Connected to: sanctum-core-01.secure.local (10.0.0.100)",
+    "  Session ID: SSH-2024-12-19-001337",
+    "",
+    "  WARNING: This system is monitored. Unauthorized access is prohibited.",
+    "           All activities are logged and subject to audit.",
+    "",
+    "  Active Cognitive Modules:",
+    "  ├─ Thalamus Input Processor      [ONLINE]",
+    "  ├─ Cerebellum Reflex Engine      [ONLINE]",
+    "  ├─ Prime Analysis Core           [ONLINE]",
+    "  └─ Memory Block Manager          [ONLINE]",
+    "",
+    "  System Status: All subsystems operational",
+    "  Threat Level: GREEN",
+    "  Last Maintenance: 2024-12-18 03:00 UTC",
+    "",
+    "  Type 'help' for available commands or 'monitor' to enter cognitive view.",
+    "",
+)
 
 class SSHLoginSimulator:
     """Handles the fake SSH login sequence with MOTD"""
     
+    __slots__ = ("app", "login_complete", "motd_lines")
+    
     def __init__(self, app):
         self.app = app
         self.login_complete = False
-        self.motd_lines = [
-            "",
-            "  ╔═══════════════════════════════════════════════════════════════════════╗",
-            "  ║                                                                       ║",
-            "  ║   ███████  █████  ███    ██  ██████ ████████ ██    ██ ███    ███     ║",
-            "  ║   ██      ██   ██ ████   ██ ██         ██    ██    ██ ████  ████     ║",
-            "  ║   ███████ ███████ ██ ██  ██ ██         ██    ██    ██ ██ ████ ██     ║",
-            "  ║        ██ ██   ██ ██  ██ ██ ██         ██    ██    ██ ██  ██  ██     ║",
-            "  ║   ███████ ██   ██ ██   ████  ██████    ██     ██████  ██      ██     ║",
-            "  ║                                                                       ║",
-            "  ║                     Security Suite v3.7.2                           ║",
-            "  ║                                                                       ║",
-            "  ║                 Cognitive Threat Analysis Platform                   ║",
-            "  ║                                                                       ║",
-            "  ╚═══════════════════════════════════════════════════════════════════════╝",
-            "",
-            "  [CLASSIFIED] Remote Access Terminal",
-            "  Connected to: sanctum-core-01.secure.local (10.0.0.100)",
-            "  Session ID: SSH-2024-12-19-001337",
-            "",
-            "  WARNING: This system is monitored. Unauthorized access is prohibited.",
-            "           All activities are logged and subject to audit.",
-            "",
-            "  Active Cognitive Modules:",
-            "  ├─ Thalamus Input Processor      [ONLINE]",
-            "  ├─ Cerebellum Reflex Engine      [ONLINE]",
-            "  ├─ Prime Analysis Core           [ONLINE]",
-            "  └─ Memory Block Manager          [ONLINE]",
-            "",
-            "  System Status: All subsystems operational",
-            "  Threat Level: GREEN",
-            "  Last Maintenance: 2024-12-18 03:00 UTC",
-            "",
-            "  Type 'help' for available commands or 'monitor' to enter cognitive view.",
-            "",
-        ]
+        self.motd_lines = _MOTD_LINES
     
     def start_login_sequence(self):
         """Start the SSH login simulation"""
@@ -119,8 +143,12 @@ class SSHLoginScreen(Screen):
         self.current_line = 0
         self.login_timer = None
         self.typing_timer = None
-        self.current_typing_line = ""
-        self.typing_index = 0
+        self._type_queue = deque()
+        self._type_done = None
+        self._input_accum = ""
+        self._input_ref = None
+        self._output_ref = None
+        self._write_output = None
         self._ssh_partial = ""
         
     def compose(self) -> ComposeResult:
@@ -139,21 +167,28 @@ class SSHLoginScreen(Screen):
     def on_mount(self):
         """Start the SSH login sequence when mounted"""
         self.styles.background = "black"
-        self.query_one("#ssh-container").styles.height = "100%"
-        self.query_one("#ssh-container").styles.width = "100%"
-        ssh_output = self.query_one("#ssh-output", RichLog)
-        ssh_output.styles.color = "green"
-        ssh_output.styles.background = "black"
-        self.query_one("#ssh-input").styles.background = "black"
-        self.query_one("#ssh-input").styles.color = "green"
+        container = self.query_one("#ssh-container")
+        container.styles.height = "100%"
+        container.styles.width = "100%"
+        
+        # Widgets are looked up once here and reused by every later step
+        self._output_ref = self.query_one("#ssh-output", RichLog)
+        self._output_ref.styles.color = "green"
+        self._output_ref.styles.background = "black"
+        self._write_output = self._output_ref.write
+        self._input_ref = self.query_one("#ssh-input", Input)
+        self._input_ref.styles.background = "black"
+        self._input_ref.styles.color = "green"
         
         # Start the login sequence
         self.start_connection_sequence()
     
     def start_connection_sequence(self):
         """Simulate SSH connection process"""
-        output = self.query_one("#ssh-output")
-        
+        self.run_worker(self._play_connection(), exclusive=False)
+    
+    async def _play_connection(self):
+        """Print the connection messages from one task, then prompt for username"""
         # Initial connection messages
         connection_msgs = [
             "Connecting to sanctum-core-01.secure.local...",
@@ -163,16 +198,18 @@ class SSHLoginScreen(Screen):
             "",
         ]
         
-        for i, msg in enumerate(connection_msgs):
-            self.set_timer(max(0.1, i * 0.3), lambda m=msg: self.add_line(m))
+        await asyncio.sleep(0.1)
+        for msg in connection_msgs:
+            self.add_line(msg)
+            await asyncio.sleep(0.3)
         
         # Start username prompt after connection messages
-        self.set_timer(len(connection_msgs) * 0.3 + 0.5, self.prompt_username)
+        await asyncio.sleep(0.5)
+        self.prompt_username()
     
     def prompt_username(self):
         """Prompt for username"""
-        output = self.query_one("#ssh-output")
-        ssh_input = self.query_one("#ssh-input")
+        ssh_input = self._input_ref
         
         self.add_line("Username: ", newline=False)
         ssh_input.placeholder = ""
@@ -180,37 +217,38 @@ class SSHLoginScreen(Screen):
         ssh_input.focus()
         
         # Auto-type username after a short delay
-        self.set_timer(0.8, lambda: self.type_text("admin"))
+        self.set_timer(0.8, partial(self.type_text, "admin"))
     
     def type_text(self, text):
         """Simulate typing text"""
-        ssh_input = self.query_one("#ssh-input")
-        self.current_typing_line = text
-        self.typing_index = 0
-        
+        # Simulate pressing enter once the last character is in
+        self._start_typing(text, partial(self.set_timer, 0.5, self.handle_username_entered))
+    
+    def _start_typing(self, text, on_done):
+        """Queue characters for the input, typed one per tick by a single interval"""
         if self.typing_timer:
             self.typing_timer.stop()
-        
-        self.typing_timer = self.set_interval(0.1, self.type_next_char)
+        self._type_queue.extend(text)
+        self._type_done = on_done
+        self._input_accum = ""
+        self.typing_timer = self.set_interval(0.1, self._drain_type_queue)
     
-    def type_next_char(self):
-        """Type the next character"""
-        ssh_input = self.query_one("#ssh-input")
+    def _drain_type_queue(self):
+        """Type the next queued character, stopping the interval when empty"""
+        if self._type_queue:
+            self._input_accum += self._type_queue.popleft()
+            self._input_ref.value = self._input_accum
+            return
         
-        if self.typing_index < len(self.current_typing_line):
-            char = self.current_typing_line[self.typing_index]
-            current_value = ssh_input.value
-            ssh_input.value = current_value + char
-            self.typing_index += 1
-        else:
-            if self.typing_timer:
-                self.typing_timer.stop()
-            # Simulate pressing enter
-            self.set_timer(0.5, self.handle_username_entered)
+        self.typing_timer.stop()
+        self.typing_timer = None
+        on_done, self._type_done = self._type_done, None
+        if on_done:
+            on_done()
     
     def handle_username_entered(self):
         """Handle username being entered"""
-        ssh_input = self.query_one("#ssh-input")
+        ssh_input = self._input_ref
         username = ssh_input.value
         
         self.add_line(username)
@@ -221,26 +259,16 @@ class SSHLoginScreen(Screen):
         self.add_line("Password: ", newline=False)
         
         # Auto-type password (shown as asterisks)
-        self.set_timer(0.8, lambda: self.type_password("********"))
+        self.set_timer(0.8, partial(self.type_password, "********"))
     
     def type_password(self, password_display):
         """Simulate typing password"""
-        ssh_input = self.query_one("#ssh-input")
-        
-        for i, char in enumerate(password_display):
-            self.set_timer(max(0.1, i * 0.1), lambda c=char: self.add_password_char(c))
-        
-        # Submit password
-        self.set_timer(len(password_display) * 0.1 + 0.5, self.handle_password_entered)
-    
-    def add_password_char(self, char):
-        """Add a password character"""
-        ssh_input = self.query_one("#ssh-input")
-        ssh_input.value += char
+        # Submit password once the last character is in
+        self._start_typing(password_display, partial(self.set_timer, 0.5, self.handle_password_entered))
     
     def handle_password_entered(self):
         """Handle password being entered"""
-        ssh_input = self.query_one("#ssh-input")
+        ssh_input = self._input_ref
         self.add_line("*" * len(ssh_input.value))
         
         ssh_input.disabled = True
@@ -255,13 +283,16 @@ class SSHLoginScreen(Screen):
         self.add_line("Authentication successful.")
         self.add_line("")
         
-        # Display MOTD line by line
-        for i, line in enumerate(self.ssh_simulator.motd_lines):
-            self.set_timer(max(0.1, i * 0.1), lambda l=line: self.add_line(l))
+        self.run_worker(self._play_motd(), exclusive=False)
+    
+    async def _play_motd(self):
+        """Display the MOTD banner in one write, then finish login"""
+        await asyncio.sleep(0.3)
+        self.add_lines(self.ssh_simulator.motd_lines)
         
         # Finish login sequence
-        total_delay = len(self.ssh_simulator.motd_lines) * 0.1 + 2.0
-        self.set_timer(total_delay, self.finish_login)
+        await asyncio.sleep(2.0)
+        self.finish_login()
     
     def finish_login(self):
         """Complete the login sequence"""
@@ -271,11 +302,15 @@ class SSHLoginScreen(Screen):
     
     def add_line(self, text, newline=True):
         """Append a line to the SSH RichLog (Static collapsed MOTD to one row)."""
-        output = self.query_one("#ssh-output", RichLog)
         if not newline:
             self._ssh_partial += text
             return
-        output.write(self._ssh_partial + text)
+        self._write_output(self._ssh_partial + text)
+        self._ssh_partial = ""
+    
+    def add_lines(self, lines):
+        """Append several lines to the SSH RichLog in a single write."""
+        self._write_output(self._ssh_partial + "\n".join(lines))
         self._ssh_partial = ""
 
 def _timeline_shared_prefix() -> List[Dict]:
@@ -548,20 +583,97 @@ def _timeline_graph_fixtures_all() -> List[Dict]:
     return out
 
 
-def build_timeline(scenario: str) -> List[Dict]:
+@lru_cache(maxsize=None)
+def build_timeline(scenario: str) -> Tuple[Dict, ...]:
+    """Build the event timeline for a scenario once; later calls share the tuple."""
     if scenario == "graph-baseline":
-        return _timeline_fixture_baseline()
+        return tuple(_timeline_fixture_baseline())
     if scenario == "graph-token-replay":
-        return _timeline_fixture_token_replay()
+        return tuple(_timeline_fixture_token_replay())
     if scenario == "graph-session-hijack":
-        return _timeline_fixture_session_hijack()
+        return tuple(_timeline_fixture_session_hijack())
     if scenario == "graph-privilege-chain":
-        return _timeline_fixture_privilege_chain()
+        return tuple(_timeline_fixture_privilege_chain())
     if scenario == "graph-fixtures":
-        return _timeline_graph_fixtures_all()
+        return tuple(_timeline_graph_fixtures_all())
     if scenario == "mitm":
-        return _timeline_shared_prefix() + _timeline_mitm_late()
-    return _timeline_shared_prefix() + _timeline_forensiq_late()
+        return tuple(_timeline_shared_prefix() + _timeline_mitm_late())
+    return tuple(_timeline_shared_prefix() + _timeline_forensiq_late())
+
+
+# Continuous background chatter (cycles continuously); shared, never mutated
+_BACKGROUND_CHATTER = (
+        {"type": "console", "level": "INFO", "message": "Database connection pool: 47/50 active", "process": "DB"},
+        {"type": "console", "level": "INFO", "message": "Active user sessions: 1,247", "process": "AUTH"},
+        {"type": "console", "level": "DEBUG", "message": "API calls/min: 8,934", "process": "API"},
+        {"type": "console", "level": "INFO", "message": "Email queue processing: 156 messages", "process": "MAIL"},
+        {"type": "console", "level": "DEBUG", "message": "CDN cache hit ratio: 94.7%", "process": "CDN"},
+        {"type": "console", "level": "INFO", "message": "VPN connections: 312 active", "process": "VPN"},
+        {"type": "console", "level": "DEBUG", "message": "File system I/O: 2.3GB/s read, 890MB/s write", "process": "FS"},
+        {"type": "console", "level": "INFO", "message": "Cloud backup sync: 78% complete", "process": "CLOUD"},
+        {"type": "console", "level": "DEBUG", "message": "Memory usage: 67% across 24 servers", "process": "SYS"},
+        {"type": "console", "level": "INFO", "message": "SSL certificate validation: 1,456 checks/min", "process": "SSL"},
+        {"type": "console", "level": "INFO", "message": "User authentication: sarah.johnson@company.com", "process": "AUTH"},
+        {"type": "console", "level": "DEBUG", "message": "Network latency: 12ms avg", "process": "NET"},
+        {"type": "console", "level": "INFO", "message": "Firewall rules updated: 3 new entries", "process": "FW"},
+        {"type": "console", "level": "DEBUG", "message": "Load balancer health check: all nodes green", "process": "LB"},
+        {"type": "console", "level": "DEBUG", "message": "CPU utilization: web01=23%, web02=31%, web03=28%", "process": "SYS"},
+        {"type": "console", "level": "INFO", "message": "User logout: mike.chen@company.com", "process": "AUTH"},
+        {"type": "console", "level": "DEBUG", "message": "Redis cache operations: 45,678/min", "process": "CACHE"},
+        {"type": "console", "level": "INFO", "message": "S3 bucket sync: 892 files transferred", "process": "CLOUD"},
+        {"type": "console", "level": "DEBUG", "message": "DNS queries resolved: 12,456/min", "process": "DNS"},
+        {"type": "console", "level": "INFO", "message": "Application deployment: v2.4.1 to staging", "process": "DEPLOY"},
+        {"type": "console", "level": "DEBUG", "message": "WebSocket connections: 1,834 active", "process": "WS"},
+        {"type": "console", "level": "INFO", "message": "Database query performance: avg 45ms", "process": "DB"},
+        {"type": "console", "level": "INFO", "message": "User login: admin@company.com from 10.0.1.45", "process": "AUTH"},
+        {"type": "console", "level": "DEBUG", "message": "Elasticsearch indexing: 23,445 docs/min", "process": "SEARCH"},
+        {"type": "console", "level": "INFO", "message": "Container health check: 47/48 healthy", "process": "DOCKER"},
+        {"type": "console", "level": "DEBUG", "message": "Message queue depth: RabbitMQ 234 msgs", "process": "MQ"},
+        {"type": "console", "level": "INFO", "message": "Log rotation completed: 15GB archived", "process": "LOG"},
+        {"type": "console", "level": "INFO", "message": "System health check: All services nominal", "process": "SYS"},
+        {"type": "console", "level": "DEBUG", "message": "Cache hit ratio: 94.2%", "process": "CACHE"},
+        {"type": "console", "level": "INFO", "message": "Kubernetes pods: 156 running, 3 pending", "process": "K8S"},
+        {"type": "console", "level": "DEBUG", "message": "Nginx access logs: 89,456 requests/min", "process": "WEB"},
+        {"type": "console", "level": "INFO", "message": "User session timeout: 12 users auto-logged out", "process": "AUTH"},
+        {"type": "console", "level": "DEBUG", "message": "Disk I/O wait time: 2.3ms avg", "process": "DISK"},
+        {"type": "console", "level": "INFO", "message": "API rate limiting: 3 clients throttled", "process": "API"},
+        {"type": "console", "level": "DEBUG", "message": "TCP connections: 45,678 established", "process": "NET"},
+        {"type": "console", "level": "DEBUG", "message": "JVM heap usage: 68% across app servers", "process": "JVM"},
+        {"type": "console", "level": "INFO", "message": "Backup verification: 847 files validated", "process": "BACKUP"},
+        {"type": "console", "level": "INFO", "message": "SSL handshake success rate: 99.7%", "process": "SSL"},
+        {"type": "console", "level": "DEBUG", "message": "MongoDB operations: 12,345 reads, 567 writes/min", "process": "MONGO"},
+        {"type": "console", "level": "INFO", "message": "CDN edge cache refresh: 234 objects updated", "process": "CDN"},
+        {"type": "console", "level": "DEBUG", "message": "Thread pool utilization: 76% avg", "process": "THREAD"},
+)
+
+# Background chatter waits (seconds): short bursts and occasional pauses
+_DELAY_POOL = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8)
+_PAUSE_POOL = (1.0, 1.5, 2.0, 2.5, 3.0)
+
+# Most overdue background events posted together after the loop falls behind
+_BACKGROUND_BATCH_MAX = 4
+
+# Randomize common patterns in background log messages (first match wins)
+_RANDOMIZERS = [(re.compile(pattern), replacement) for pattern, replacement in [
+    (r'(\d+)/(\d+) active', lambda m: f"{random.randint(int(m.group(1))-5, int(m.group(1))+5)}/{m.group(2)} active"),
+    (r'(\d+,\d+)', lambda m: f"{random.randint(1000, 9999):,}"),
+    (r'(\d+) messages', lambda m: f"{random.randint(100, 300)} messages"),
+    (r'(\d+\.\d+)%', lambda m: f"{random.uniform(90, 99):.1f}%"),
+    (r'(\d+) active', lambda m: f"{random.randint(int(m.group(1))-50, int(m.group(1))+50)} active"),
+    (r'(\d+\.\d+)GB/s', lambda m: f"{random.uniform(1.8, 2.8):.1f}GB/s"),
+    (r'(\d+)MB/s', lambda m: f"{random.randint(800, 1200)}MB/s"),
+    (r'(\d+)ms avg', lambda m: f"{random.randint(8, 20)}ms avg"),
+    (r'(\d+) servers', lambda m: f"{random.randint(20, 28)} servers"),
+    (r'(\d+) running', lambda m: f"{random.randint(150, 170)} running"),
+    (r'(\d+) pending', lambda m: f"{random.randint(1, 8)} pending"),
+]]
+
+# All randomizers fused into one alternation so a message is scanned once;
+# the named group that matched selects the randomizer to apply
+_RANDOMIZER_GROUPS = {f"r{i}": entry for i, entry in enumerate(_RANDOMIZERS)}
+_RANDOMIZER_PATTERN = re.compile("|".join(
+    f"(?P<{name}>{pattern.pattern})" for name, (pattern, _) in _RANDOMIZER_GROUPS.items()
+))
 
 
 class EventEngine:
@@ -570,177 +682,148 @@ class EventEngine:
     def __init__(self, app):
         self.app = app
         self.event_index = 0
-        self.timeline_timer: Optional[Timer] = None
-        self.background_timer: Optional[Timer] = None
         self.background_index = 0
         self.test_mode = TEST_MODE
+        # Test-mode debug log, opened once and line-buffered rather than per event
+        self._debug_log = open("debug.log", "a", buffering=1) if self.test_mode else None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._started = False
         
-        # Continuous background chatter (cycles continuously)
-        self.background_chatter = [
-            {"type": "console", "level": "INFO", "message": "Database connection pool: 47/50 active", "process": "DB"},
-            {"type": "console", "level": "INFO", "message": "Active user sessions: 1,247", "process": "AUTH"},
-            {"type": "console", "level": "DEBUG", "message": "API calls/min: 8,934", "process": "API"},
-            {"type": "console", "level": "INFO", "message": "Email queue processing: 156 messages", "process": "MAIL"},
-            {"type": "console", "level": "DEBUG", "message": "CDN cache hit ratio: 94.7%", "process": "CDN"},
-            {"type": "console", "level": "INFO", "message": "VPN connections: 312 active", "process": "VPN"},
-            {"type": "console", "level": "DEBUG", "message": "File system I/O: 2.3GB/s read, 890MB/s write", "process": "FS"},
-            {"type": "console", "level": "INFO", "message": "Cloud backup sync: 78% complete", "process": "CLOUD"},
-            {"type": "console", "level": "DEBUG", "message": "Memory usage: 67% across 24 servers", "process": "SYS"},
-            {"type": "console", "level": "INFO", "message": "SSL certificate validation: 1,456 checks/min", "process": "SSL"},
-            {"type": "console", "level": "INFO", "message": "User authentication: sarah.johnson@company.com", "process": "AUTH"},
-            {"type": "console", "level": "DEBUG", "message": "Network latency: 12ms avg", "process": "NET"},
-            {"type": "console", "level": "INFO", "message": "Firewall rules updated: 3 new entries", "process": "FW"},
-            {"type": "console", "level": "DEBUG", "message": "Load balancer health check: all nodes green", "process": "LB"},
-            {"type": "console", "level": "DEBUG", "message": "CPU utilization: web01=23%, web02=31%, web03=28%", "process": "SYS"},
-            {"type": "console", "level": "INFO", "message": "User logout: mike.chen@company.com", "process": "AUTH"},
-            {"type": "console", "level": "DEBUG", "message": "Redis cache operations: 45,678/min", "process": "CACHE"},
-            {"type": "console", "level": "INFO", "message": "S3 bucket sync: 892 files transferred", "process": "CLOUD"},
-            {"type": "console", "level": "DEBUG", "message": "DNS queries resolved: 12,456/min", "process": "DNS"},
-            {"type": "console", "level": "INFO", "message": "Application deployment: v2.4.1 to staging", "process": "DEPLOY"},
-            {"type": "console", "level": "DEBUG", "message": "WebSocket connections: 1,834 active", "process": "WS"},
-            {"type": "console", "level": "INFO", "message": "Database query performance: avg 45ms", "process": "DB"},
-            {"type": "console", "level": "INFO", "message": "User login: admin@company.com from 10.0.1.45", "process": "AUTH"},
-            {"type": "console", "level": "DEBUG", "message": "Elasticsearch indexing: 23,445 docs/min", "process": "SEARCH"},
-            {"type": "console", "level": "INFO", "message": "Container health check: 47/48 healthy", "process": "DOCKER"},
-            {"type": "console", "level": "DEBUG", "message": "Message queue depth: RabbitMQ 234 msgs", "process": "MQ"},
-            {"type": "console", "level": "INFO", "message": "Log rotation completed: 15GB archived", "process": "LOG"},
-            {"type": "console", "level": "INFO", "message": "System health check: All services nominal", "process": "SYS"},
-            {"type": "console", "level": "DEBUG", "message": "Cache hit ratio: 94.2%", "process": "CACHE"},
-            {"type": "console", "level": "INFO", "message": "Kubernetes pods: 156 running, 3 pending", "process": "K8S"},
-            {"type": "console", "level": "DEBUG", "message": "Nginx access logs: 89,456 requests/min", "process": "WEB"},
-            {"type": "console", "level": "INFO", "message": "User session timeout: 12 users auto-logged out", "process": "AUTH"},
-            {"type": "console", "level": "DEBUG", "message": "Disk I/O wait time: 2.3ms avg", "process": "DISK"},
-            {"type": "console", "level": "INFO", "message": "API rate limiting: 3 clients throttled", "process": "API"},
-            {"type": "console", "level": "DEBUG", "message": "TCP connections: 45,678 established", "process": "NET"},
-            {"type": "console", "level": "DEBUG", "message": "JVM heap usage: 68% across app servers", "process": "JVM"},
-            {"type": "console", "level": "INFO", "message": "Backup verification: 847 files validated", "process": "BACKUP"},
-            {"type": "console", "level": "INFO", "message": "SSL handshake success rate: 99.7%", "process": "SSL"},
-            {"type": "console", "level": "DEBUG", "message": "MongoDB operations: 12,345 reads, 567 writes/min", "process": "MONGO"},
-            {"type": "console", "level": "INFO", "message": "CDN edge cache refresh: 234 objects updated", "process": "CDN"},
-            {"type": "console", "level": "DEBUG", "message": "Thread pool utilization: 76% avg", "process": "THREAD"},
-        ]
-
+        self.background_chatter = _BACKGROUND_CHATTER
         self.timeline = build_timeline(SCENARIO)
+    
     def start_demo(self):
         """Start both the demo timeline and background chatter"""
-        if not self.timeline_timer:
-            self.timeline_timer = self.app.set_interval(1.5, self.next_timeline_event)  # 1.5s between timeline events
-        # Start background chatter with first random delay
-        self.schedule_next_background_event()
-    
-    def next_timeline_event(self):
-        """Process the next event in the main timeline"""
-        if self.event_index >= len(self.timeline):
-            if self.timeline_timer:
-                self.timeline_timer.stop()
-            self.app.post_message(DemoComplete())
+        if self._started:
             return
+        self._started = True
         
-        event = self.timeline[self.event_index]
-        if self.test_mode:
-            print(f"[DEBUG] Processing timeline event {self.event_index}: {event['type']}")
-        self.event_index += 1
-        self._process_event(event)
-    
-    def schedule_next_background_event(self):
-        """Schedule the next background event with random timing"""
-        # Random delay between 100ms and 800ms for realistic bursts
-        delay = random.uniform(0.1, 0.8)
+        # One consumer posts whatever either producer queues, as soon as it arrives
+        self.app.run_worker(self._consume_events(), exclusive=False)
+        self.app.run_worker(self._produce_timeline(), exclusive=False)
+        self.app.run_worker(self._produce_background(), exclusive=False)
+    
+    async def _consume_events(self):
+        """Post queued events to the app; None marks the end of the timeline"""
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                self.app.post_message(DemoComplete())
+            elif isinstance(event, list):
+                # Background chatter that fell due together
+                self.app.post_message(ConsoleLogBatch(
+                    [(e["level"], e["message"], e["process"], e.get("highlight", False)) for e in event]
+                ))
+            else:
+                self._process_event(event)
+    
+    async def _produce_timeline(self):
+        """Queue the main timeline events, 1.5s apart"""
+        while self.event_index < len(self.timeline):
+            await asyncio.sleep(1.5)
+            event = self.timeline[self.event_index]
+            if self.test_mode:
+                print(f"[DEBUG] Processing timeline event {self.event_index}: {event['type']}")
+            self.event_index += 1
+            await self._queue.put(event)
         
-        # Occasionally add longer pauses (10% chance of 1-3 second pause)
-        if random.random() < 0.1:
-            delay = random.uniform(1.0, 3.0)
+        await asyncio.sleep(1.5)
+        await self._queue.put(None)
+    
+    async def _produce_background(self):
+        """Queue background chatter events at random intervals (cycles continuously)
         
-        self.app.set_timer(delay, self.next_background_event)
+        If the loop was busy past several due times, the overdue events are
+        queued together as one list (up to _BACKGROUND_BATCH_MAX) so the
+        console writes them at once; anything further behind is dropped.
+        """
+        next_due = time.monotonic() + self.next_background_delay()
+        while True:
+            await asyncio.sleep(max(0.0, next_due - time.monotonic()))
+            
+            now = time.monotonic()
+            batch = []
+            while next_due <= now and len(batch) < _BACKGROUND_BATCH_MAX:
+                batch.append(self.next_background_event())
+                next_due += self.next_background_delay()
+            if next_due <= now:
+                next_due = now + self.next_background_delay()
+            # The timer can fire slightly early (clock resolution); nothing is due yet
+            if not batch:
+                continue
+            
+            await self._queue.put(batch[0] if len(batch) == 1 else batch)
+    
+    def next_background_delay(self):
+        """Pick the random wait before the next background event"""
+        # Occasionally add longer pauses (10% chance of 1-3 second pause),
+        # otherwise 100-800ms for realistic bursts
+        return random.choice(_PAUSE_POOL if random.random() < 0.1 else _DELAY_POOL)
     
     def next_background_event(self):
-        """Process the next background chatter event (cycles continuously)"""
-        event = self.background_chatter[self.background_index % len(self.background_chatter)].copy()
+        """Return the next background chatter event (cycles continuously)"""
+        event = self.background_chatter[self.background_index % len(self.background_chatter)]
         self.background_index += 1
         
         # Add some randomization to make logs feel more dynamic
-        event = self._randomize_log_message(event)
-        
-        self._process_event(event)
-        
-        # Schedule the next background event with random timing
-        self.schedule_next_background_event()
+        return self._randomize_log_message(event)
     
     def _randomize_log_message(self, event):
-        """Add some randomization to numeric values in log messages"""
-        if event["type"] != "console":
+        """Add some randomization to numeric values in log messages
+        
+        The shared event is returned as-is unless a value is randomized, in
+        which case a copy carries the new message.
+        """
+        # Apply randomization with 30% chance to keep some predictability
+        if random.random() >= 0.3 or event["type"] != "console":
             return event
         
         message = event["message"]
+        match = _RANDOMIZER_PATTERN.search(message)
+        if not match:
+            return event
         
-        # Randomize common patterns in log messages
-        replacements = [
-            (r'(\d+)/(\d+) active', lambda m: f"{random.randint(int(m.group(1))-5, int(m.group(1))+5)}/{m.group(2)} active"),
-            (r'(\d+,\d+)', lambda m: f"{random.randint(1000, 9999):,}"),
-            (r'(\d+) messages', lambda m: f"{random.randint(100, 300)} messages"),
-            (r'(\d+\.\d+)%', lambda m: f"{random.uniform(90, 99):.1f}%"),
-            (r'(\d+) active', lambda m: f"{random.randint(int(m.group(1))-50, int(m.group(1))+50)} active"),
-            (r'(\d+\.\d+)GB/s', lambda m: f"{random.uniform(1.8, 2.8):.1f}GB/s"),
-            (r'(\d+)MB/s', lambda m: f"{random.randint(800, 1200)}MB/s"),
-            (r'(\d+)ms avg', lambda m: f"{random.randint(8, 20)}ms avg"),
-            (r'(\d+) servers', lambda m: f"{random.randint(20, 28)} servers"),
-            (r'(\d+) running', lambda m: f"{random.randint(150, 170)} running"),
-            (r'(\d+) pending', lambda m: f"{random.randint(1, 8)} pending"),
-        ]
-        
-        # Apply randomization with 30% chance to keep some predictability
-        if random.random() < 0.3:
-            for pattern, replacement in replacements:
-                if re.search(pattern, message):
-                    try:
-                        message = re.sub(pattern, replacement, message)
-                        break  # Only apply one randomization per message
-                    except:
-                        pass  # If randomization fails, keep original
-        
-        event["message"] = message
-        return event
+        # Only apply one randomization per message
+        pattern, replacement = _RANDOMIZER_GROUPS[match.lastgroup]
+        start = match.start()
+        message = message[:start] + replacement(pattern.match(message, start)) + message[match.end():]
+        return {**event, "message": message}
+    
+    # Event type -> factory for the message posted to the app
+    _DISPATCH = {
+        "console": lambda e: ConsoleLog(e["level"], e["message"], e["process"], e.get("highlight", False)),
+        "cerebellum_internal": lambda e: CerebellumInternalMessage(e["sender"], e["message"]),
+        "escalation": lambda e: EscalationMessage(e["message"]),
+        "prime_response": lambda e: PrimeResponseMessage(e["message"]),
+        "inter_agent": lambda e: InterAgentMessage(e["sender"], e["message"]),
+        "prime_tool": lambda e: PrimeToolMessage(e["action"], e["message"]),
+        "memory": lambda e: MemoryBlock(e["data"]),
+    }
     
     def _process_event(self, event):
+        factory = self._DISPATCH.get(event["type"])
+        if factory is None:
+            return
         
-        if event["type"] == "console":
-            self.app.post_message(ConsoleLog(
-                level=event["level"],
-                message=event["message"],
-                process=event["process"],
-                highlight=event.get("highlight", False)
-            ))
-        elif event["type"] == "cerebellum_internal":
-            self.app.post_message(CerebellumInternalMessage(
-                sender=event["sender"],
-                message=event["message"]
-            ))
-        elif event["type"] == "escalation":
-            self.app.post_message(EscalationMessage(
-                message=event["message"]
-            ))
-        elif event["type"] == "prime_response":
-            self.app.post_message(PrimeResponseMessage(
-                message=event["message"]
-            ))
-        elif event["type"] == "inter_agent":
-            self.app.post_message(InterAgentMessage(
-                sender=event["sender"],
-                message=event["message"]
-            ))
-        elif event["type"] == "prime_tool":
-            self.app.post_message(PrimeToolMessage(
-                action=event["action"],
-                message=event["message"]
-            ))
-        elif event["type"] == "memory":
-            if self.test_mode:
-                with open("debug.log", "a") as f:
-                    f.write(f"[DEBUG] Posting memory block message: {event['data'].get('title', 'NO TITLE')}\n")
-            self.app.post_message(MemoryBlock(data=event["data"]))
+        if event["type"] == "memory":
+            self.debug(f"Posting memory block message: {event['data'].get('title', 'NO TITLE')}")
+        self.app.post_message(factory(event))
+    
+    def debug(self, msg):
+        """Append a line to debug.log in test mode"""
+        if self._debug_log is not None:
+            self._debug_log.write(f"[DEBUG] {msg}\n")
+    
+    def close(self):
+        """Close the test-mode debug log"""
+        if self._debug_log is not None:
+            self._debug_log.close()
+            self._debug_log = None
 
-# Custom messages for inter-widget communication
+# Custom messages for inter-widget communication (slotted: one is allocated per event)
 class ConsoleLog(Message):
+    __slots__ = ("level", "message", "process", "highlight")
+    
     def __init__(self, level: str, message: str, process: str, highlight: bool = False):
         self.level = level
         self.message = message
@@ -748,41 +831,71 @@ class ConsoleLog(Message):
         self.highlight = highlight  # True if this message is sent to Cerebellum
         super().__init__()
 
+class ConsoleLogBatch(Message):
+    __slots__ = ("entries",)
+    
+    def __init__(self, entries: List[tuple]):
+        self.entries = entries  # (level, message, process, highlight) per line
+        super().__init__()
+
 class CerebellumInternalMessage(Message):
+    __slots__ = ("sender", "message")
+    
     def __init__(self, sender: str, message: str):
         self.sender = sender
         self.message = message
         super().__init__()
 
 class EscalationMessage(Message):
+    __slots__ = ("message",)
+    
     def __init__(self, message: str):
         self.message = message
         super().__init__()
 
 class PrimeResponseMessage(Message):
+    __slots__ = ("message",)
+    
     def __init__(self, message: str):
         self.message = message
         super().__init__()
 
 class InterAgentMessage(Message):
+    __slots__ = ("sender", "message")
+    
     def __init__(self, sender: str, message: str):
         self.sender = sender
         self.message = message
         super().__init__()
 
 class PrimeToolMessage(Message):
+    __slots__ = ("action", "message")
+    
     def __init__(self, action: str, message: str):
         self.action = action
         self.message = message
         super().__init__()
 
 class MemoryBlock(Message):
+    __slots__ = ("data",)
+    
     def __init__(self, data: Dict):
         self.data = data
         super().__init__()
 
 class DemoComplete(Message):
-    pass
+    __slots__ = ()
+
+# Color coding for different console log levels
+_LEVEL_COLORS = {
+    "DEBUG": "bright_black",
+    "INFO": "bright_blue",
+    "WARN": "yellow",
+    "ERROR": "red",
+    "CRITICAL": "bright_red",
+}
+_LEVEL_STYLES = {level: f"bold {color}" for level, color in _LEVEL_COLORS.items()}
+_CEREBELLUM_MARKER = " <<< [→ CEREBELLUM]"
 
 class ConsolePane(RichLog):
     """Right column - Console log output"""
@@ -800,18 +913,15 @@ class ConsolePane(RichLog):
         
     def add_log(self, level: str, message: str, process: str, highlight: bool = False):
         """Add a log entry with proper formatting"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        
-        # Color coding for different log levels
-        level_colors = {
-            "DEBUG": "bright_black",
-            "INFO": "bright_blue", 
-            "WARN": "yellow",
-            "ERROR": "red",
-            "CRITICAL": "bright_red"
-        }
-        
-        color = level_colors.get(level, "white")
+        self.write(self.format_log(level, message, process, highlight))
+    
+    def add_logs(self, entries):
+        """Add several (level, message, process, highlight) entries in one write"""
+        self.write(Text("\n").join(self.format_log(*entry) for entry in entries))
+    
+    def format_log(self, level: str, message: str, process: str, highlight: bool = False) -> Text:
+        """Format one log entry as a styled line"""
+        timestamp = _ts()
         
         # Format: [timestamp] [LEVEL] process: message
         log_line = Text()
@@ -819,17 +929,17 @@ class ConsolePane(RichLog):
         
         if highlight:
             # Highlighted messages sent to Cerebellum
-            log_line.append(f"[{level:>8}] >>> ", style=f"bold bright_yellow")
+            log_line.append(f"[{level:>8}] >>> ", style="bold bright_yellow")
             log_line.append(f"{process:>6}: ", style="bright_yellow")
             log_line.append(message, style="bright_white")
-            log_line.append(" <<< [→ CEREBELLUM]", style="bold bright_yellow")
+            log_line.append(_CEREBELLUM_MARKER, style="bold bright_yellow")
         else:
             # Regular system logs
-            log_line.append(f"[{level:>8}] ", style=f"bold {color}")
+            log_line.append(f"[{level:>8}] ", style=_LEVEL_STYLES.get(level, "bold white"))
             log_line.append(f"{process:>6}: ", style="bright_green")
             log_line.append(message, style="white")
         
-        self.write(log_line)
+        return log_line
 
 class ToolMessage(Static):
     """Tool action message widget - always instant display"""
@@ -838,39 +948,48 @@ class ToolMessage(Static):
         super().__init__()
         self.action = action
         self.message = message
+        self._content: Optional[Static] = None
         
     def compose(self) -> ComposeResult:
         yield Static("", id="tool-content")
         
     def on_mount(self):
         """Display tool message immediately"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = _ts()
         formatted_text = Text()
         formatted_text.append(f"[{timestamp}] ", style="bright_black")
         formatted_text.append(f"[Tool: {self.action}] ", style="bold yellow")
         formatted_text.append(self.message, style="yellow")
         
-        content = self.query_one("#tool-content", Static)
-        content.update(formatted_text)
+        self._content = self.query_one("#tool-content", Static)
+        self._content.update(formatted_text)
 
 class ChatMessage(Static):
     """Individual chat message widget with streaming capability"""
     
+    # Stream a few characters per tick (~66 chars/second) instead of one per refresh
+    STREAM_INTERVAL = 0.06
+    STREAM_CHUNK = 4
+    
     def __init__(self, sender: str, message: str, sender_color: str = "white", should_stream: bool = True):
         super().__init__()
         self.sender = sender
         self.message = message
         self.sender_color = sender_color
+        self._sender_style = _sender_style(sender_color)  # fixed for the widget's lifetime
         self.should_stream = should_stream
         self.current_text = ""
         self.char_index = 0
         self.streaming_timer: Optional[Timer] = None
+        self._content: Optional[Static] = None
         
     def compose(self) -> ComposeResult:
         yield Static("", id="message-content")
         
     def on_mount(self):
         """Start streaming the message when mounted"""
+        # Resolved once; every streaming tick updates the same child
+        self._content = self.query_one("#message-content", Static)
         if self.should_stream:
             self.start_streaming()
         else:
@@ -878,38 +997,37 @@ class ChatMessage(Static):
         
     def display_full_message(self):
         """Display the complete message immediately"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = _ts()
         formatted_text = self.format_complete_message(timestamp, self.sender, self.message)
-        content = self.query_one("#message-content", Static)
-        content.update(formatted_text)
+        self._content.update(formatted_text)
         
     def start_streaming(self):
-        """Begin character-by-character streaming of message text only"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        # Display timestamp and sender immediately
+        """Begin chunked streaming of message text only"""
+        timestamp = _ts()
+        # Display timestamp and sender immediately; both are fixed for the
+        # rest of the stream, so keep them rather than re-parsing each tick
+        self._timestamp = timestamp
         self.static_part = f"[{timestamp}] {self.sender}: "
         self.streaming_part = self.message
         self.char_index = 0
         self.current_text = ""
         
         # Display static part immediately
-        formatted_text = self.format_partial_message(self.static_part, "")
-        content = self.query_one("#message-content", Static)
-        content.update(formatted_text)
+        formatted_text = self.format_partial_message("")
+        self._content.update(formatted_text)
         
-        # Start streaming timer for message text (30ms = ~33 chars/second)
-        self.streaming_timer = self.set_interval(0.03, self.stream_next_char)
+        # Start streaming timer for message text
+        self.streaming_timer = self.set_interval(self.STREAM_INTERVAL, self.stream_next_char)
         
     def stream_next_char(self):
-        """Add the next character of the message to the display"""
+        """Add the next chunk of the message to the display"""
         if self.char_index < len(self.streaming_part):
-            self.current_text = self.streaming_part[:self.char_index + 1]
-            self.char_index += 1
+            self.char_index += self.STREAM_CHUNK
+            self.current_text = self.streaming_part[:self.char_index]
             
             # Format the text with colors
-            formatted_text = self.format_partial_message(self.static_part, self.current_text)
-            content = self.query_one("#message-content", Static)
-            content.update(formatted_text)
+            formatted_text = self.format_partial_message(self.current_text)
+            self._content.update(formatted_text)
         else:
             # Streaming complete
             if self.streaming_timer:
@@ -919,37 +1037,32 @@ class ChatMessage(Static):
         """Format complete message with proper colors"""
         formatted = Text()
         formatted.append(f"[{timestamp}] ", style="bright_black")
-        formatted.append(f"{sender}:", style=f"bold {self.sender_color}")
+        formatted.append(f"{sender}:", style=self._sender_style)
         formatted.append(f" {message}", style="white")
         return formatted
         
-    def format_partial_message(self, static_part: str, streaming_part: str) -> Text:
+    def format_partial_message(self, streaming_part: str) -> Text:
         """Format partial message during streaming"""
-        # Parse static part: [timestamp] sender: 
-        match = re.match(r'(\[[\d:]+\])\s+([^:]+):\s*', static_part)
-        if match:
-            timestamp, sender = match.groups()
-            
-            formatted = Text()
-            formatted.append(f"[{timestamp}] ", style="bright_black")
-            formatted.append(f"{sender}:", style=f"bold {self.sender_color}")
-            formatted.append(f" {streaming_part}", style="white")
-            return formatted
-        else:
-            return Text(static_part + streaming_part, style="white")
+        return self.format_complete_message(self._timestamp, self.sender, streaming_part)
+
+@lru_cache(maxsize=None)
+def _sender_style(sender_color: str) -> str:
+  """Bold sender style for a color, built once and shared by every line."""
+  return f"bold {sender_color}"
+
 
 def format_chat_line(sender: str, message: str, sender_color: str = "white") -> Text:
   """Format a chat line for RichLog panes (renders reliably in terminal capture)."""
-  timestamp = datetime.now().strftime('%H:%M:%S')
+  timestamp = _ts()
   line = Text()
   line.append(f"[{timestamp}] ", style="bright_black")
-  line.append(f"{sender}:", style=f"bold {sender_color}")
+  line.append(f"{sender}:", style=_sender_style(sender_color))
   line.append(f" {message}", style="white")
   return line
 
 
 def format_tool_line(action: str, message: str) -> Text:
-  timestamp = datetime.now().strftime('%H:%M:%S')
+  timestamp = _ts()
   line = Text()
   line.append(f"[{timestamp}] ", style="bright_black")
   line.append(f"[Tool: {action}] ", style="bold yellow")
@@ -1022,6 +1135,7 @@ class MemoryPane(RichLog):
       markup=True,
       wrap=True,
       auto_scroll=True,
+      max_lines=MEMORY_MAX_LINES,
     )
     self.border_title = "MEMORY CORE"
 
@@ -1131,6 +1245,14 @@ class SanctumApp(App):
         self.event_engine = EventEngine(self)
         self.ssh_simulator = SSHLoginSimulator(self)
         self.main_ui_ready = False
+        # (due, seq, callback) min-heap drained by one repeating tick; seq keeps
+        # entries with equal due times in order without comparing callbacks
+        self._delayed = []
+        self._delayed_seq = itertools.count()
+        self._cerebellum: Optional[CerebellumPane] = None
+        self._prime: Optional[PrimePane] = None
+        self._memory: Optional[MemoryPane] = None
+        self._console: Optional[ConsolePane] = None
         
     def compose(self) -> ComposeResult:
         """Create the main layout"""
@@ -1152,9 +1274,18 @@ class SanctumApp(App):
         if TEST_MODE:
             print("[TEST] App mounted, starting SSH login...")
         
+        # Panes are looked up once; every message handler reuses them
+        self._cerebellum = self.query_one("#cerebellum-pane", CerebellumPane)
+        self._prime = self.query_one("#prime-pane", PrimePane)
+        self._memory = self.query_one("#memory-pane", MemoryPane)
+        self._console = self.query_one("#console-pane", ConsolePane)
+        
         # Start with SSH login simulation
         self.ssh_simulator.start_login_sequence()
         
+        # Single tick that runs every delayed UI callback
+        self.set_interval(0.1, self._drain_delayed)
+        
         # Auto-close timer if enabled
         if AUTO_CLOSE:
             timeout_seconds = AUTO_CLOSE_SECONDS
@@ -1162,67 +1293,82 @@ class SanctumApp(App):
                 timeout_seconds = 130.0 if SCENARIO == "graph-fixtures" else 25.0
             self.set_timer(timeout_seconds, self.exit)  # Includes SSH login pre-roll
     
+    def call_delayed(self, delay: float, callback):
+        """Run callback after roughly delay seconds (100ms resolution)"""
+        heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._delayed_seq), callback))
+    
+    def _drain_delayed(self):
+        """Run every delayed callback that has come due"""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            heapq.heappop(self._delayed)[2]()
+    
+    def _write_chat_to(self, sender: str, message: str, sender_color: str, *panes):
+        """Format one chat line and write the same Text to each pane in order"""
+        line = format_chat_line(sender, message, sender_color)
+        for pane in panes:
+            pane.write(line)
+    
     def on_console_log(self, message: ConsoleLog):
         """Handle console log messages"""
-        console = self.query_one("#console-pane", ConsolePane)
-        console.add_log(message.level, message.message, message.process, message.highlight)
+        self._console.add_log(message.level, message.message, message.process, message.highlight)
+    
+    def on_console_log_batch(self, message: ConsoleLogBatch):
+        """Handle a burst of console log messages"""
+        self._console.add_logs(message.entries)
     
     def on_cerebellum_internal_message(self, message: CerebellumInternalMessage):
         """Handle internal cerebellum messages (Thalamus → Cerebellum only)"""
-        cerebellum = self.query_one("#cerebellum-pane", CerebellumPane)
         sender_color = "bright_blue" if message.sender == "Thalamus" else "bright_green"
-        cerebellum.write_chat(message.sender, message.message, sender_color)
+        self._cerebellum.write_chat(message.sender, message.message, sender_color)
     
     def on_escalation_message(self, message: EscalationMessage):
         """Handle escalation from Cerebellum to Prime (appears in both windows)"""
-        cerebellum = self.query_one("#cerebellum-pane", CerebellumPane)
-        prime = self.query_one("#prime-pane", PrimePane)
+        cerebellum = self._cerebellum
+        prime = self._prime
         
         def add_escalation():
-            cerebellum.write_chat("Cerebellum", message.message, "bright_green")
-            prime.write_chat("Cerebellum", message.message, "bright_green")
+            self._write_chat_to("Cerebellum", message.message, "bright_green", cerebellum, prime)
             
-        self.set_timer(1.0, add_escalation)  # 1 second delay
+        self.call_delayed(1.0, add_escalation)  # 1 second delay
     
     def on_prime_response_message(self, message: PrimeResponseMessage):
         """Handle Prime Agent response to escalation"""
-        prime = self.query_one("#prime-pane", PrimePane)
+        prime = self._prime
         
         def add_response():
             prime.write_chat("Prime", message.message, "bright_cyan")
             
-        self.set_timer(1.5, add_response)  # 1.5 second delay
+        self.call_delayed(1.5, add_response)  # 1.5 second delay
     
     def on_inter_agent_message(self, message: InterAgentMessage):
         """Handle inter-agent communication (appears in both windows)"""
-        cerebellum = self.query_one("#cerebellum-pane", CerebellumPane)
-        prime = self.query_one("#prime-pane", PrimePane)
+        cerebellum = self._cerebellum
+        prime = self._prime
         
         if message.sender == "Prime":
-            prime.write_chat("Prime", message.message, "bright_cyan")
-            cerebellum.write_chat("Prime", message.message, "bright_cyan")
+            self._write_chat_to("Prime", message.message, "bright_cyan", prime, cerebellum)
         else:
-            cerebellum.write_chat("Cerebellum", message.message, "bright_green")
-            prime.write_chat("Cerebellum", message.message, "bright_green")
+            self._write_chat_to("Cerebellum", message.message, "bright_green", cerebellum, prime)
     
     def on_prime_tool_message(self, message: PrimeToolMessage):
         """Handle Prime Agent tool actions"""
-        prime = self.query_one("#prime-pane", PrimePane)
-        prime.write_tool(message.action, message.message)
+        self._prime.write_tool(message.action, message.message)
     
     def on_memory_block(self, message: MemoryBlock):
         """Handle memory block creation"""
-        if TEST_MODE:
-            with open("debug.log", "a") as f:
-                f.write(f"[DEBUG] Creating memory block: {message.data.get('title', 'NO TITLE')}\n")
-        memory = self.query_one("#memory-pane", MemoryPane)
-        memory.add_memory_block(message.data)
+        self.event_engine.debug(f"Creating memory block: {message.data.get('title', 'NO TITLE')}")
+        self._memory.add_memory_block(message.data)
     
     def on_demo_complete(self, message: DemoComplete):
         """Handle demo completion"""
         if AUTO_CLOSE:
             self.set_timer(2.0, self.exit)
     
+    def on_unmount(self):
+        """Release the event engine's debug log on shutdown"""
+        self.event_engine.close()
+    
     def action_quit(self):
         """Quit the application"""
         self.exit()
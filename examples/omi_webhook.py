@@ -18,21 +18,62 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import os
+import json
+import logging
+import threading
+from logging.handlers import MemoryHandler
 from flask import Flask, request
 
+# Use orjson for webhook payloads when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+class IntervalMemoryHandler(MemoryHandler):
+    """MemoryHandler that a daemon thread also flushes every flush_interval seconds."""
+
+    def __init__(self, capacity, flush_interval=1.0, **kwargs):
+        super().__init__(capacity, **kwargs)
+        self.flush_interval = flush_interval
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="omi-log-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stopped.set()
+        super().close()
+
+# Request logs are buffered and written every 256 records or every second;
+# errors flush right away. Payloads log at DEBUG; set OMI_LOG_LEVEL=DEBUG to show them
+log = logging.getLogger("omi")
+log.setLevel(os.getenv("OMI_LOG_LEVEL", "INFO").upper())
+log.addHandler(IntervalMemoryHandler(
+    capacity=256, flush_interval=1.0,
+    flushLevel=logging.ERROR, target=logging.StreamHandler()
+))
+log.propagate = False
+
 app = Flask(__name__)
 
 @app.route("/omi", methods=["POST"])
 def omi_webhook():
-    print(f"🔎 Incoming POST: {request.method} {request.url}")
+    log.info("🔎 Incoming POST: %s %s", request.method, request.url)
 
     try:
-        data = request.get_json(force=True)
-        print("\n🔥 Cerebellum Input [UNRESTRICTED]:")
-        print(data)
+        data = _json_loads(request.get_data(cache=False))
+        # Formatted only when the buffered record is written out
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("🔥 Cerebellum Input [UNRESTRICTED]: %s", data)
         return "OK", 200
     except Exception as e:
-        print(f"💥 Failed to parse incoming data: {e}")
+        log.error("💥 Failed to parse incoming data: %s", e)
         return "Bad Request", 400
 
 @app.route("/ping", methods=["GET"])
@@ -40,4 +81,10 @@ def ping():
     return "pong", 200
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
+    # Serve with waitress (multi-threaded) when installed; otherwise Flask's dev server
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host="0.0.0.0", port=5000, threaded=True)
+    else:
+        serve(app, host="0.0.0.0", port=5000, threads=8)
@@ -22,6 +22,9 @@ import os
 import json
 import openai
 import logging
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Iterator, Union
 from dotenv import load_dotenv
 
 # Configure logging
@@ -31,27 +34,61 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Set OpenAI API key
-openai.api_key = os.getenv("OPENAI_API_KEY")
+@lru_cache(maxsize=1)
+def _get_client() -> "openai.OpenAI":
+    """One client for the process so calls reuse its pooled HTTPS connection.
+    
+    Created on first use, so importing this module never requires the API key.
+    """
+    return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def call_openai_text(prompt: str) -> str:
-    """Call OpenAI API with text prompt and return response."""
+# Use orjson for dict prompts when available
+try:
+    import orjson
+    _json_dumps = lambda obj: orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
+def _chat_messages(prompt) -> list:
+    """Build the chat messages for a text (or mapping) prompt."""
+    # Ensure prompt is a string; strings pass through untouched
+    if isinstance(prompt, Mapping):
+        prompt = _json_dumps(prompt if isinstance(prompt, dict) else dict(prompt))
+    
+    return [
+        {"role": "system", "content": "You are a helpful assistant that provides responses in valid JSON format."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _stream_openai_text(response) -> Iterator[str]:
+    """Yield the text deltas of a streamed completion as they arrive."""
+    try:
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except Exception as e:
+        logger.error(f"Error streaming OpenAI response: {e}")
+        raise
+
+def call_openai_text(prompt: Union[str, Mapping], stream: bool = False) -> Union[str, Iterator[str]]:
+    """Call OpenAI API with text prompt and return response.
+    
+    With stream=True, return a generator of text deltas instead, so the
+    caller can start on the first tokens before the completion finishes.
+    """
     try:
-        # Ensure prompt is a string
-        if isinstance(prompt, dict):
-            prompt = json.dumps(prompt)
-        
         # Call OpenAI API
-        response = openai.chat.completions.create(
+        response = _get_client().chat.completions.create(
             model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that provides responses in valid JSON format."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=_chat_messages(prompt),
             temperature=0.7,
-            max_tokens=100
+            max_tokens=100,
+            stream=stream
         )
         
+        if stream:
+            return _stream_openai_text(response)
+        
         # Extract response text
         response_text = response.choices[0].message.content
         
@@ -67,8 +104,9 @@ def call_openai_text(prompt: str) -> str:
 if __name__ == '__main__':
     # Test the API
     try:
-        result = call_openai_text("Hello, how are you?")
-        print(result)
+        for text in call_openai_text("Hello, how are you?", stream=True):
+            print(text, end="", flush=True)
+        print()
     except Exception as e:
         logger.error("Error in test call: %s", e)
         print("Error:", e)
@@ -19,10 +19,12 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import json
-import time
+import asyncio
+import calendar
 import logging
+from functools import lru_cache
 from datetime import datetime, UTC
-from database import init_db, get_or_create_session, get_or_create_speaker, insert_segment
+from database import init_db, get_or_create_session, get_or_create_speaker, get_or_create_speakers, insert_segment, insert_segments
 
 # Configure logging with more detailed format
 logging.basicConfig(
@@ -32,50 +34,146 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def process_event(event):
-    """Process a single event and store it in the database."""
+# Use orjson for the replay log when available; both accept raw bytes
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+def parse_log_timestamp(log_timestamp):
+    """Parse an event's ISO log timestamp."""
+    # fromisoformat accepts the trailing 'Z' natively since Python 3.11
+    return datetime.fromisoformat(log_timestamp)
+
+def parse_log_epoch(log_timestamp):
+    """Seconds since the epoch for a log timestamp, as a float.
+    
+    The replay log uses fixed 'YYYY-MM-DDTHH:MM:SS[.ffffff]Z' stamps, which
+    are sliced directly; anything else goes through parse_log_timestamp.
+    """
+    ts = log_timestamp
+    if len(ts) >= 20 and ts[-1] == 'Z' and ts[10] == 'T':
+        try:
+            seconds = calendar.timegm((
+                int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                int(ts[11:13]), int(ts[14:16]), int(ts[17:19]), 0, 0, 0
+            ))
+            fraction = ts[19:-1]
+            return seconds + float(fraction) if fraction else float(seconds)
+        except ValueError:
+            pass
+    return parse_log_timestamp(log_timestamp).timestamp()
+
+# Sessions and speakers are upserted once per process; later events hit the cache
+@lru_cache(maxsize=4096)
+def cached_session_id(session_id):
+    """Database ID for a session, creating it on first sight."""
+    return get_or_create_session(session_id)
+
+# Speaker name -> database ID (speakers are unique by name)
+_speaker_ids = {}
+
+def resolve_speaker_ids(speaker_names):
+    """Database IDs for speaker names, creating unseen ones in one batch.
+    
+    If the batch fails the names stay unresolved; resolve_speaker_id then
+    retries them one at a time.
+    """
+    missing = [name for name in speaker_names if name not in _speaker_ids]
+    if missing:
+        try:
+            _speaker_ids.update(get_or_create_speakers(missing))
+        except Exception as e:
+            logger.error("Batch speaker lookup failed, resolving speakers one at a time: %s", e)
+    return _speaker_ids
+
+def resolve_speaker_id(speaker_name):
+    """Database ID for one speaker name, creating it if needed."""
+    db_speaker_id = _speaker_ids.get(speaker_name)
+    if db_speaker_id is None:
+        db_speaker_id = get_or_create_speaker(None, speaker_name)
+        _speaker_ids[speaker_name] = db_speaker_id
+    return db_speaker_id
+
+def process_event(event, current_timestamp=None):
+    """Process a single event and store it in the database.
+    
+    Pass the already-parsed log timestamp (a datetime or epoch seconds)
+    as current_timestamp to skip parsing it again.
+    """
+    # Checked once per event so filtered-out log calls cost nothing per segment
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    info_enabled = logger.isEnabledFor(logging.INFO)
     try:
         # Get current event timestamp
-        current_timestamp = datetime.fromisoformat(event['log_timestamp'].replace('Z', '+00:00'))
-        logger.debug("Processing event at timestamp: %s", current_timestamp)
+        if current_timestamp is None:
+            current_timestamp = parse_log_timestamp(event['log_timestamp'])
+        if debug_enabled:
+            logger.debug("Processing event at timestamp: %s", current_timestamp)
         
         # Get or create session
         session_id = event['session_id']
-        db_session_id = get_or_create_session(session_id)
-        logger.debug("Using database session ID: %d for session: %s", db_session_id, session_id)
+        db_session_id = cached_session_id(session_id)
+        if debug_enabled:
+            logger.debug("Using database session ID: %d for session: %s", db_session_id, session_id)
 
-        # Process segments
-        for segment in event['segments']:
+        # Resolve every speaker in the event up front, then store all
+        # segments in one transaction
+        segments = event['segments']
+        event_speakers = {segment['speaker'] for segment in segments if 'speaker' in segment}
+        resolve_speaker_ids(event_speakers)
+        rows = []
+        for segment in segments:
             try:
-                # Get or create speaker
-                speaker_id = int(segment['speaker_id'])  # Convert to integer
-                db_speaker_id = get_or_create_speaker(
-                    speaker_id=speaker_id,
-                    speaker_name=segment['speaker'],
-                    is_user=segment.get('is_user', False)
-                )
-                logger.debug("Using database speaker ID: %d for speaker: %s", db_speaker_id, segment['speaker'])
-
-                # Insert segment into database
-                segment_id = insert_segment(
-                    session_id=db_session_id,
-                    speaker_id=db_speaker_id,
-                    text=segment['text'],
-                    start_time=segment['start'],
-                    end_time=segment['end'],
-                    log_timestamp=current_timestamp
+                db_speaker_id = resolve_speaker_id(segment['speaker'])
+                if debug_enabled:
+                    logger.debug("Using database speaker ID: %d for speaker: %s", db_speaker_id, segment['speaker'])
+
+                row = (
+                    db_session_id,
+                    db_speaker_id,
+                    segment['text'],
+                    segment['start'],
+                    segment['end'],
+                    current_timestamp
                 )
-                logger.info("Processed segment %d from %s: %s", 
-                          segment_id, segment['speaker'], segment['text'][:50] + "...")
+                # Reject rows the NOT NULL columns would refuse, so one bad
+                # segment can't fail the whole batch
+                if None in row[2:5]:
+                    raise ValueError(f"segment is missing text/start/end: {segment!r}")
+                rows.append(row)
             except Exception as e:
                 logger.error("Error processing segment: %s", e, exc_info=True)
                 continue
+        
+        try:
+            insert_segments(rows)
+            stored = rows
+        except Exception as e:
+            # Fall back to one insert per row so only the failing segments are lost
+            logger.error("Batch insert failed, storing segments one at a time: %s", e)
+            stored = []
+            for row in rows:
+                try:
+                    insert_segment(*row)
+                    stored.append(row)
+                except Exception as e:
+                    logger.error("Error storing segment: %s", e, exc_info=True)
+        
+        if info_enabled:
+            speaker_names = {_speaker_ids[name]: name for name in event_speakers if name in _speaker_ids}
+            for row in stored:
+                logger.info("Processed segment from %s: %s", 
+                          speaker_names[row[1]], row[2][:50] + "...")
+        if debug_enabled:
+            logger.debug("Stored %d segments for session: %s", len(stored), session_id)
                 
     except Exception as e:
         logger.error("Error processing event: %s", e, exc_info=True)
         raise
 
-def main():
+async def main_async():
     try:
         # Initialize database first
         logger.info("Initializing database...")
@@ -85,25 +183,35 @@ def main():
         # Read events from file line by line
         import os
         data_file = os.path.join(os.path.dirname(__file__), 'raw_data_log.json')
-        with open(data_file, 'r') as f:
+        with open(data_file, 'rb') as f:
             last_timestamp = None
+            pending = None
             for line in f:
-                event = json.loads(line)
-                current_timestamp = datetime.fromisoformat(event['log_timestamp'].replace('Z', '+00:00'))
+                event = _json_loads(line)
+                current_timestamp = parse_log_epoch(event['log_timestamp'])
                 
-                # If we have a previous timestamp, wait the appropriate amount of time
-                if last_timestamp:
-                    time_diff = (current_timestamp - last_timestamp).total_seconds()
+                # If we have a previous timestamp, wait the appropriate amount of time;
+                # the previous event is still being stored in a worker thread meanwhile
+                if last_timestamp is not None:
+                    time_diff = current_timestamp - last_timestamp
                     if time_diff > 0:
                         print(f"Waiting {time_diff:.2f} seconds to simulate real-time processing...")
-                        time.sleep(time_diff)
+                        await asyncio.sleep(time_diff)
                 
                 last_timestamp = current_timestamp
                 
-                # Process the event
-                process_event(event)
+                # Process the event, keeping events in order
+                if pending:
+                    await pending
+                pending = asyncio.create_task(asyncio.to_thread(process_event, event, current_timestamp))
+            
+            if pending:
+                await pending
     except Exception as e:
         print(f"Error processing events: {e}")
 
+def main():
+    asyncio.run(main_async())
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file
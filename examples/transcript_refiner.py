@@ -18,16 +18,18 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import json
 import time
 import logging
 import os
+from collections import OrderedDict
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from database import (
-    get_unrefined_segments, insert_refined_segment,
+    get_unrefined_segments,
     get_refined_segments, get_locked_segments, get_db,
-    update_refined_segment, get_refined_segment, get_active_sessions,
-    get_or_create_speaker
+    update_refined_segment, get_refined_segment,
+    get_or_create_speaker, insert_refined_segments, get_unrefined_segments_by_session
 )
 from openai_wrapper import call_openai_text
 import re
@@ -46,21 +48,41 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class TranscriptRefiner:
-    def __init__(self, min_segments_for_diarization=4, inactivity_seconds=120):
+    def __init__(self, min_segments_for_diarization=4, inactivity_seconds=120,
+                 min_poll=0.25, max_poll=10.0, backoff=1.5):
         self.min_segments = min_segments_for_diarization
         self.sentence_endings = ['.', '!', '?', '...']
         self.inactivity_seconds = inactivity_seconds
         self.session_states = {}  # session_id -> { speaker_id, group, last_received }
+        # Idle polling backs off from min_poll to max_poll; any new segment resets it
+        self._min_poll = min_poll
+        self._max_poll = max_poll
+        self._backoff = backoff
+        self._poll_interval = min_poll
+        # (speaker_id, speaker_name) -> speakers.id, least recently used first
+        self._speaker_cache = OrderedDict()
+        self._speaker_cache_size = 1024
         logger.info("TranscriptRefiner initialized with min_segments_for_diarization=%d, inactivity_seconds=%d", 
                    min_segments_for_diarization, inactivity_seconds)
 
-    def process_session(self, session_id: str) -> bool:
-        """Process new segments for a session while maintaining state."""
+    def process_session(self, session_id: str, segments: Optional[List[Dict]] = None) -> int:
+        """Process new segments for a session while maintaining state.
+        
+        Pass the session's unrefined segments if already fetched; otherwise
+        they are queried here. Returns the number of new segments taken in
+        (0 when idle or on error).
+        """
         try:
-            # Get unrefined segments for this session
-            segments = get_unrefined_segments(session_id)
+            # Get unrefined segments for this session; the open group's
+            # segments stay unrefined until it is finalized, so skip them
+            if segments is None:
+                segments = get_unrefined_segments(session_id)
+            state = self.session_states.get(session_id)
+            if state and state["group"]:
+                grouped = {s['id'] for s in state["group"]}
+                segments = [s for s in segments if s['id'] not in grouped]
             if not segments:
-                return True
+                return 0
                 
             logger.info(f"Processing {len(segments)} new segments for session {session_id}")
             
@@ -77,38 +99,52 @@ class TranscriptRefiner:
             
             state = self.session_states[session_id]
             
-            for segment in segments:
-                # Update last received time
-                state["last_received"] = datetime.utcnow()
-                
-                # Check for speaker change
-                if state["speaker_id"] is not None and segment['speaker_id'] != state["speaker_id"]:
-                    # Finalize current group before starting new one
-                    if state["group"]:
-                        self._finalize_group(state["group"], session_id)
-                        state["group"] = []
+            # Groups finalized this tick, written together at the end
+            pending_inserts = []
+            for speaker_id, run in groupby(segments, key=itemgetter('speaker_id')):
+                run = list(run)
+                if speaker_id == state["speaker_id"]:
+                    # Same speaker as the open group carried over from the last tick
+                    state["group"].extend(run)
+                    continue
                 
-                # Update current speaker and add segment to group
-                state["speaker_id"] = segment['speaker_id']
-                state["group"].append(segment)
+                # Speaker change: finalize the current group and open a new one
+                if state["group"]:
+                    pending_inserts.append(self._finalize_group(state["group"], session_id))
+                state["speaker_id"] = speaker_id
+                state["group"] = run
+            
+            # The last group stays open until the speaker changes or it goes idle
+            state["last_received"] = datetime.utcnow()
             
-            return True
+            if pending_inserts:
+                insert_refined_segments(pending_inserts)
+            return len(segments)
             
         except Exception as e:
             logger.error(f"Error processing session {session_id}: {e}")
-            return False
+            return 0
 
-    def _finalize_group(self, segments: List[Dict], session_id: str) -> None:
-        """Finalize a group of segments from the same speaker."""
-        if not segments:
-            return
-            
+    def _finalize_group(self, segments: List[Dict], session_id: str) -> Dict:
+        """Build the refined segment for a non-empty group from the same speaker.
+        
+        Returns insert_refined_segment keyword arguments; callers collect
+        them and write each batch with insert_refined_segments.
+        """
         # Get speaker info from first segment
         speaker_id = segments[0]['speaker_id']
         speaker_name = segments[0]['speaker_name']
         
-        # Get or create speaker using the standalone function
-        refined_speaker_id = get_or_create_speaker(speaker_id, speaker_name)
+        # Get or create speaker, hitting the database only on a cache miss
+        key = (speaker_id, speaker_name)
+        refined_speaker_id = self._speaker_cache.get(key)
+        if refined_speaker_id is None:
+            refined_speaker_id = get_or_create_speaker(speaker_id, speaker_name)
+            self._speaker_cache[key] = refined_speaker_id
+            if len(self._speaker_cache) > self._speaker_cache_size:
+                self._speaker_cache.popitem(last=False)
+        else:
+            self._speaker_cache.move_to_end(key)
         
         # Get timing info
         start_time = min(s['start_time'] for s in segments)
@@ -120,25 +156,28 @@ class TranscriptRefiner:
         # Get source segment IDs
         source_segments = [s['id'] for s in segments]
         
-        # Insert refined segment
-        insert_refined_segment(
+        return dict(
             session_id=session_id,
             refined_speaker_id=refined_speaker_id,
             text=combined_text,
             start_time=start_time,
             end_time=end_time,
-            source_segments=json.dumps(source_segments)
+            source_segments=source_segments
         )
 
     def flush_idle_sessions(self):
         """Flush any sessions that have been inactive for too long."""
         current_time = datetime.utcnow()
+        pending_inserts = []
         for session_id, state in list(self.session_states.items()):
             idle_duration = (current_time - state["last_received"]).total_seconds()
             if idle_duration >= self.inactivity_seconds and state["group"]:
                 logger.info(f"Idle timeout flush for session {session_id} after {idle_duration}s inactivity")
-                self._finalize_group(state["group"], session_id)
+                pending_inserts.append(self._finalize_group(state["group"], session_id))
                 del self.session_states[session_id]
+        
+        if pending_inserts:
+            insert_refined_segments(pending_inserts)
 
     def run(self):
         """Main processing loop."""
@@ -146,20 +185,23 @@ class TranscriptRefiner:
         
         while True:
             try:
-                # Get all active sessions
-                sessions = get_active_sessions()
+                # Unrefined segments for every active session, in one query
+                pending = get_unrefined_segments_by_session()
                 
-                for session in sessions:
-                    session_id = session['session_id']
-                    
+                new_segments = 0
+                for session_id, segments in pending.items():
                     # Process any unprocessed segments while maintaining state
-                    self.process_session(session_id)
+                    new_segments += self.process_session(session_id, segments)
                 
                 # Flush any idle sessions
                 self.flush_idle_sessions()
                 
-                # Sleep briefly to prevent CPU spinning
-                time.sleep(1)
+                # Poll again quickly while segments arrive, back off while idle
+                if new_segments:
+                    self._poll_interval = self._min_poll
+                else:
+                    self._poll_interval = min(self._max_poll, self._poll_interval * self._backoff)
+                time.sleep(self._poll_interval)
                 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
@@ -19,9 +19,9 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import os
+import functools
 import requests
 import json
-import re
 import logging
 
 def get_image_dimensions(image_path):
@@ -37,7 +37,18 @@ def get_image_dimensions(image_path):
         return None
     
 def load_prompt(filename: str, prompts_dir: str = "./prompts") -> str:
-    """Load a prompt from a markdown (.md) file."""
+    """
+    Load a prompt from a markdown (.md) file.
+
+    Prompts are cached after the first read; set PROMPT_NO_CACHE to re-read
+    the file on every call while editing prompts.
+    """
+    if os.getenv("PROMPT_NO_CACHE"):
+        return _read_prompt(filename, prompts_dir)
+    return _cached_prompt(filename, prompts_dir)
+
+
+def _read_prompt(filename: str, prompts_dir: str) -> str:
     prompt_path = os.path.join(prompts_dir, filename)
     try:
         with open(prompt_path, 'r', encoding='utf-8') as file:
@@ -47,6 +58,42 @@ def load_prompt(filename: str, prompts_dir: str = "./prompts") -> str:
         raise
 
 
+_cached_prompt = functools.lru_cache(maxsize=64)(_read_prompt)
+
+
+def _extract_json(s: str) -> str | None:
+    """
+    Returns the first balanced {...} object in s, or None if there is none.
+
+    A single linear pass counting brace depth; braces inside string
+    literals (including escaped quotes) are ignored.
+    """
+    start = s.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    i = start
+    n = len(s)
+    while i < n:
+        ch = s[i]
+        if in_string:
+            if ch == "\\":
+                i += 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return s[start:i + 1]
+        i += 1
+    return None
+
+
 def clean_response(response: str, return_dict: bool = False) -> str | dict:
     """
     Cleans and processes a JSON response safely.
@@ -54,7 +101,7 @@ def clean_response(response: str, return_dict: bool = False) -> str | dict:
     Steps:
     1. Removes markdown code fences if present.
     2. Strips leading/trailing whitespace.
-    3. Uses regex to extract JSON if standard parsing fails.
+    3. Extracts the first balanced JSON object if standard parsing fails.
     
     Args:
         response (str): The raw JSON response string.
@@ -67,6 +114,16 @@ def clean_response(response: str, return_dict: bool = False) -> str | dict:
         json.JSONDecodeError if the input cannot be parsed.
     """
 
+    # Fast path: the model returned bare JSON, so skip the cleanup steps
+    if isinstance(response, str):
+        stripped = response.strip()
+        if stripped[:1] == "{" and stripped[-1:] == "}":
+            try:
+                parsed_json = json.loads(stripped)
+                return parsed_json if return_dict else json.dumps(parsed_json)
+            except json.JSONDecodeError:
+                pass
+
     # Step 1: Remove markdown-style code fences if present.
     if response.startswith("```"):
         lines = response.splitlines()
@@ -94,12 +151,12 @@ def clean_response(response: str, return_dict: bool = False) -> str | dict:
         parsed_json = json.loads(response)
         return parsed_json if return_dict else json.dumps(parsed_json)
     except json.JSONDecodeError as e:
-        # Step 5: Try extracting JSON using regex
-        match = re.search(r'({.*})', response, re.DOTALL)
-        if match:
+        # Step 5: Try extracting the embedded JSON object
+        candidate = _extract_json(response)
+        if candidate is not None:
             try:
-                parsed_json = json.loads(match.group(1))
-                return parsed_json if return_dict else match.group(1)
+                parsed_json = json.loads(candidate)
+                return parsed_json if return_dict else candidate
             except json.JSONDecodeError:
                 pass
         logging.error("Failed to parse JSON: %s", e)